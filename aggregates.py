@@ -0,0 +1,101 @@
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from processing import DAY_ORDER
+from regression import SufficientStats
+
+HISTOGRAM_BINS = 30
+
+# Columns read by the grouped tables
+AGGREGATE_COLUMNS = ['Day', 'Hour', 'Map', 'Kills', 'Deaths', 'KD_Ratio']
+
+# Trendline sufficient statistics kept per filter selection; 0 disables
+TREND_STATS_CACHE_SIZE = 64
+_trend_stats_cache = OrderedDict()
+_trend_stats_lock = threading.Lock()
+
+
+def histogram(values, bins=HISTOGRAM_BINS):
+    """Bin values into fixed-width bins; returns (counts, bin edges).
+
+    NaN and infinite values are ignored, as plotly's histogram does.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    return np.histogram(values, bins=bins)
+
+
+class MatchAggregates:
+    """Server-side aggregates of one filtered selection.
+
+    The per-hour, per-map and day x hour tables all come from a single
+    group-by over (Day, Hour, Map), computed the first time any of them is
+    used. key identifies the filter selection (see analysis.filter_key) and
+    lets trendline statistics be reused across callbacks. When the dataset's
+    StatsCube selection for the same filters is given, the per-hour and
+    per-map tables are summed from its cells instead.
+    """
+
+    def __init__(self, data, key=None, selection=None):
+        self.data = data
+        self.key = key
+        self.selection = selection
+
+    @functools.cached_property
+    def grouped(self):
+        data = self.data
+        return (data.assign(KD_Ratio=data['KD_Ratio'].astype(np.float64))
+                .groupby(['Day', 'Hour', 'Map'], observed=True)
+                .agg(Kills=('Kills', 'sum'),
+                     Deaths=('Deaths', 'sum'),
+                     KD_Sum=('KD_Ratio', 'sum'),
+                     KD_Count=('KD_Ratio', 'count'),
+                     Matches=('KD_Ratio', 'size')))
+
+    @functools.cached_property
+    def by_hour(self):
+        """Mean K/D ratio per hour of day."""
+        if self.selection is not None:
+            return self.selection.by_hour
+        hourly = self.grouped.groupby(level='Hour')[['KD_Sum', 'KD_Count']].sum()
+        hourly = hourly[hourly['KD_Count'] > 0]
+        return (hourly['KD_Sum'] / hourly['KD_Count']).rename('KD_Ratio')
+
+    @functools.cached_property
+    def by_map(self):
+        """Total kills and deaths per map."""
+        if self.selection is not None:
+            return self.selection.by_map
+        return self.grouped.groupby(level='Map', observed=True)[['Kills', 'Deaths']].sum()
+
+    @functools.cached_property
+    def day_hour(self):
+        """Match counts as a Monday-first day x hour table."""
+        counts = self.grouped.groupby(level=['Day', 'Hour'], observed=True)['Matches'].sum()
+        return counts.unstack('Hour', fill_value=0).reindex(pd.Index(DAY_ORDER, name='Day'))
+
+    def trend_stats(self, x, y, group):
+        """Return the SufficientStats of y against x per group value."""
+        cache_key = None if self.key is None else (self.key, x, y, group)
+        if cache_key is not None and TREND_STATS_CACHE_SIZE:
+            with _trend_stats_lock:
+                if cache_key in _trend_stats_cache:
+                    _trend_stats_cache.move_to_end(cache_key)
+                    return _trend_stats_cache[cache_key]
+        stats = SufficientStats.from_columns(self.data[x], self.data[y], self.data[group])
+        if cache_key is not None and TREND_STATS_CACHE_SIZE:
+            with _trend_stats_lock:
+                _trend_stats_cache[cache_key] = stats
+                while len(_trend_stats_cache) > TREND_STATS_CACHE_SIZE:
+                    _trend_stats_cache.popitem(last=False)
+        return stats
+
+    def histogram(self, column, bins=HISTOGRAM_BINS, mask=None):
+        values = self.data[column].to_numpy()
+        if mask is not None:
+            values = values[mask]
+        return histogram(values, bins)
@@ -1,15 +1,9 @@
 import datetime
+import functools
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from dash import html, dcc, Input, Output, State, callback, callback_context, no_update, dash, Dash
-import pandas as pd
+from dash import html, dcc, Input, Output, State, callback, callback_context, no_update, Dash, ClientsideFunction, Patch
 import dash_bootstrap_components as dbc
 
-# Global variables
-global data
-data = pd.DataFrame()  # Start with empty DataFrame
-
 # Initialize the Dash app
 app = Dash(__name__, 
            external_stylesheets=[dbc.themes.DARKLY],
@@ -17,12 +11,198 @@ app = Dash(__name__,
                       'content': 'width=device-width, initial-scale=1.0'}],
            suppress_callback_exceptions=True)
 
-from html_parser import parse_html_file
-import base64
-import io
+from html_parser import parse_html_stream
+from csv_loader import read_csv
+from processing import process_data, local_timezone
+from dataset_cache import DatasetCache, digest_key, HAVE_ARROW
+from match_store import MatchStore
+from upload_store import UploadStore
+from dataset_store import DatasetStore
+from filter_index import FilterIndex
+from cube import StatsCube
+from figures import FIGURES, TIME_SERIES_FIGURES, empty_figure
+from figure_cache import FigureCache
+from figure_patch import figure_shape, data_patch
+from aggregates import MatchAggregates
+from stats import compute_stats, stats_from_totals
+from projection import DASHBOARD_COLUMNS, FILTERED_COLUMNS
+from frame_ipc import decode_frame
+from client_payload import CLIENT_FIGURES, SERVER_FIGURES, encode_dataset, figure_templates, to_json_data
+from instrumentation import Instrumentation
+from debug_panel import debug_panel, register_debug_callbacks
+from flask import Response, request, jsonify
+import hashlib
+import os
+import tempfile
+import uuid
+
+# Callback timings for the debug panel and /metrics; INSTRUMENTATION=1 turns
+# them on and PROFILE_SAMPLE_RATE profiles that fraction of callbacks
+instrumentation = Instrumentation(
+    enabled=os.environ.get('INSTRUMENTATION') == '1',
+    profile_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0)))
+
+# CLIENTSIDE_FILTERING=1 sends each loaded dataset to the browser once and
+# answers filter changes there (assets/clientside_filter.js) instead of
+# with a server round trip per change. The damage scatter is still drawn by
+# the server and the time-series charts are not shown (see client_payload)
+CLIENTSIDE_FILTERING = os.environ.get('CLIENTSIDE_FILTERING') == '1'
+
+# Export columns loaded for the dashboard; FULL_FIDELITY=1 keeps every column
+DATASET_COLUMNS = None if os.environ.get('FULL_FIDELITY') == '1' else DASHBOARD_COLUMNS
+
+# Processed frames keyed by the SHA-256 of the uploaded bytes
+dataset_cache = DatasetCache(
+    os.environ.get('DATASET_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'data_analysis_cache')),
+    max_bytes=int(os.environ.get('DATASET_CACHE_MAX_BYTES', 1 << 30)))
+
+# Export uploads in progress, streamed to disk in chunks by the browser
+# (assets/chunked_upload.js) and parsed from there
+upload_store = UploadStore(
+    os.environ.get('UPLOAD_DIR', os.path.join(tempfile.gettempdir(), 'data_analysis_uploads')),
+    max_bytes=int(os.environ.get('UPLOAD_MAX_BYTES', 1 << 30)))
+
+# Largest chunk the upload route accepts in one request
+UPLOAD_CHUNK_BYTES = 4 << 20
+
+# Ingest runs as a background callback in its own process when diskcache is
+# installed, so a long parse neither hits the worker timeout nor holds up
+# other sessions' callbacks; without it the ingest runs inline
+try:
+    import diskcache
+    from dash import DiskcacheManager
+    background_callback_manager = DiskcacheManager(diskcache.Cache(
+        os.environ.get('BACKGROUND_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'data_analysis_jobs'))))
+except ImportError:
+    background_callback_manager = None
+
+# Datasets grown by incremental uploads, stored as appended parts
+match_store = MatchStore(
+    os.environ.get('MATCH_STORE_DIR', os.path.join(tempfile.gettempdir(), 'data_analysis_matches'))
+) if HAVE_ARROW else None
+
+
+def store_dataset(dataset_id):
+    """Return (name, version) for a '<name>@<version>' match store dataset ID, else None."""
+    if match_store is None or not dataset_id or '@' not in dataset_id:
+        return None
+    name, version = dataset_id.rsplit('@', 1)
+    return name, int(version)
+
+
+def load_stored_dataset(dataset_id):
+    """Load a dataset ID from disk: the match store for store IDs, else the cache."""
+    stored = store_dataset(dataset_id)
+    if stored is not None:
+        return match_store.load(*stored)
+    if '@' in dataset_id:
+        return None
+    return dataset_cache.get(dataset_id)
+
+
+# Loaded datasets per dataset ID; the ID lives in each session's dcc.Store and
+# workers that have not seen a dataset yet load it from disk
+dataset_store = DatasetStore(
+    max_bytes=int(os.environ.get('DATASET_STORE_MAX_BYTES', 512 << 20)),
+    loader=load_stored_dataset)
+
+
+# Serialised figures keyed by (filter_key, figure id)
+figure_cache = FigureCache(
+    max_bytes=int(os.environ.get('FIGURE_CACHE_MAX_BYTES', 64 << 20)),
+    ttl=float(os.environ.get('FIGURE_CACHE_TTL', 600)))
+
+
+def load_dataset(content, parse, digest=None):
+    """Load a raw export into the dataset store.
+
+    content is the export's bytes or a binary file opened on them, in which
+    case digest, their hashlib SHA-256, must be given. parse(content,
+    columns=...) reads only the DATASET_COLUMNS projection. Returns
+    (dataset ID, processed frame, cache hit).
+    """
+    if digest is None:
+        digest = hashlib.sha256(content)
+    size = len(content) if isinstance(content, bytes) else os.fstat(content.fileno()).st_size
+    # The local UTC offset is part of the key because 'Local Time' depends on it
+    key = digest_key(digest, local_timezone(), DATASET_COLUMNS)
+    with instrumentation.span('load_dataset', bytes_in=size) as span:
+        frame = dataset_cache.get(key)
+        cached = frame is not None
+        if not cached:
+            frame = process_data(parse(content, columns=DATASET_COLUMNS))
+            dataset_cache.put(key, frame)
+        span.update(rows_out=len(frame), cached=cached)
+    dataset_store.put(key, frame)
+    return key, frame, cached
+
+
+def ingest_incremental(current_id, content, progress=None):
+    """Append the matches of an export (bytes or a binary file) that the current
+    dataset does not have yet.
+
+    The merged dataset is not loaded into memory; its filters are answered
+    from the match store (see filter_dataset). progress is passed on to
+    parse_html_stream. Returns (dataset ID, number of new matches kept after
+    processing).
+    """
+    # The export is newest first, so parsing stops at the first known match
+    stored = store_dataset(current_id)
+    known = match_store.match_ids(*stored) if stored is not None else set(
+        get_dataset_columns(current_id, ['Match ID'])['Match ID'].astype(str))
+    new_matches = parse_html_stream(content, known_match_ids=known, columns=DATASET_COLUMNS,
+                                    progress=progress)
+    new_matches = process_data(new_matches) if not new_matches.empty else new_matches
+    if new_matches.empty:
+        return current_id, 0
+
+    # Append on top of the caller's version while it is the latest of its
+    # chain; otherwise (an uploaded dataset, or a version another session
+    # has since appended to) start a chain of the caller's dataset of its own
+    version = None
+    if stored is not None:
+        name = stored[0]
+        version = match_store.append(name, new_matches, after=stored[1])
+    if version is None:
+        name = f'merge-{uuid.uuid4().hex}'
+        base = match_store.append(name, get_dataset(current_id))
+        version = match_store.append(name, new_matches, after=base)
+    return f'{name}@{version}', len(new_matches)
 
 
-# print(data.columns)
+def register_dataset(format, data):
+    """Add a frame processed elsewhere (the browser build's parser worker) to
+    the dataset store. format and data come from frame_ipc.encode_frame.
+    Returns the new dataset ID.
+    """
+    dataset_id = f'frame-{uuid.uuid4().hex}'
+    dataset_store.put(dataset_id, decode_frame(format, data))
+    return dataset_id
+
+
+def get_dataset(dataset_id):
+    """Return the caller's dataset, or an empty DataFrame if none is loaded."""
+    frame = dataset_store.get(dataset_id)
+    return frame if frame is not None else pd.DataFrame()
+
+
+def has_dataset(dataset_id):
+    stored = store_dataset(dataset_id)
+    if stored is not None:
+        return dataset_id in dataset_store or match_store.exists(*stored)
+    return dataset_store.get(dataset_id) is not None
+
+
+def get_dataset_columns(dataset_id, columns):
+    """Return some columns of a dataset, reading only those from the match store
+    when the dataset is not loaded."""
+    stored = store_dataset(dataset_id)
+    if stored is not None and dataset_id not in dataset_store:
+        frame = match_store.load(*stored, columns=columns)
+        return frame if frame is not None else pd.DataFrame()
+    frame = get_dataset(dataset_id)
+    return frame[columns] if not frame.empty else frame
+
 
 # Create filter widgets with checkboxes
 def create_checkbox_group(id_prefix, name, options):
@@ -78,313 +258,243 @@ date_range = dcc.DatePickerRange(
     }
 )
 
-# Set default plot dimensions
-PLOT_HEIGHT = 300
-PLOT_WIDTH = 490
-    
-# Create plots using hvPlot
-def get_filtered_data(operators, game_types, maps, date_range):
+# Filtered frames kept for reuse across callbacks of the same interaction.
+# This saves the second callback's filtering, a few milliseconds (see
+# benchmarks/bench_interaction.py); figure building dominates the interaction
+FILTER_CACHE_SIZE = 4
+
+
+def filter_key(dataset_id, operators, game_types, maps, date_range):
+    """Normalise the filter inputs into a hashable key."""
+    return (dataset_id,
+            tuple(sorted(operators or [])),
+            tuple(sorted(game_types or [])),
+            tuple(sorted(maps or [])),
+            str(date_range[0]),
+            str(date_range[1]))
+
+
+def get_filtered_data(dataset_id, operators, game_types, maps, date_range):
     # Return empty DataFrame if any filter category is empty
-    if not operators or not game_types or not maps:
-        return pd.DataFrame(columns=data.columns)
-        
-    filtered = data.copy()
-    
-    # Basic filters with checkbox lists
-    if operators:
-        filtered = filtered[filtered['Operator'].isin(operators)]
-    if game_types:
-        filtered = filtered[filtered['Game Type'].isin(game_types)]
-    if maps:
-        filtered = filtered[filtered['Map'].isin(maps)]
-    
-    # Date range filter with proper timezone handling
-    local_tz = datetime.datetime.now().astimezone().tzinfo
-    start_time = pd.Timestamp(date_range[0]).tz_localize(local_tz)
-    end_time = pd.Timestamp(date_range[1]).tz_localize(local_tz)
-    
-    # Ensure timestamps are in the correct timezone before comparison
-    filtered = filtered[
-        (filtered['Local Time'] >= start_time) &
-        (filtered['Local Time'] <= end_time)
-    ]
+    if not operators or not game_types or not maps or not has_dataset(dataset_id):
+        return pd.DataFrame()
 
-    # Add debug print statements
-    # print(f"Filtering stats:")
-    # print(f"Total rows before filter: {len(data)}")
-    # print(f"Operators filter: {operators}")
-    # print(f"Game Types filter: {game_types}")
-    # print(f"Maps filter: {maps}")
-    # print(f"Date range: {start_time} to {end_time}")
-    # print(f"Remaining rows after filter: {len(filtered)}")
-    
+    # create_plots and create_stats fire on the same inputs and share the result
+    with instrumentation.span('get_filtered_data') as span:
+        filtered = filter_dataset(filter_key(dataset_id, operators, game_types, maps, date_range))
+        if dataset_id in dataset_store:
+            span['rows_in'] = len(dataset_store.get(dataset_id))
+        span['rows_out'] = len(filtered)
     return filtered
 
-@callback(
-    Output('plots-container', 'children'),
-    [Input('operator-checklist', 'value'),
-     Input('game-type-checklist', 'value'),
-     Input('map-checklist', 'value'),
-     Input('date-range-picker', 'start_date'),
-     Input('date-range-picker', 'end_date')]
-)
-def create_plots(operator, game_type, map_name, start_date, end_date):
+
+def date_range_times(start_date, end_date):
+    """Return the date picker range as timestamps in the local timezone."""
+    local_tz = datetime.datetime.now().astimezone().tzinfo
+    return pd.Timestamp(start_date).tz_localize(local_tz), pd.Timestamp(end_date).tz_localize(local_tz)
+
+
+@functools.lru_cache(maxsize=FILTER_CACHE_SIZE)
+def filter_dataset(key):
+    """Return the filtered rows for a filter_key; callers must not modify it."""
+    dataset_id, operators, game_types, maps, start_date, end_date = key
+    selections = {'Operator': operators, 'Game Type': game_types, 'Map': maps}
+    start_time, end_time = date_range_times(start_date, end_date)
+
+    # Match store datasets that are not loaded in this worker are filtered by
+    # the Parquet reader, which reads only the matching row groups and the
+    # columns the figures and stats read
+    stored = store_dataset(dataset_id)
+    if stored is not None and dataset_id not in dataset_store:
+        return match_store.query(*stored, selections, start_time, end_time, columns=FILTERED_COLUMNS)
+
+    # Checklist filters and the date range resolve to row positions on the
+    # dataset's filter index, so only the final selection is copied
+    data = get_dataset(dataset_id)
+    index = dataset_store.derived(dataset_id, 'filter_index', FilterIndex)
+    rows = index.select(selections, start_time, end_time)
+
+    return data.iloc[rows]
+
+
+def build_stats_cube(dataset_id):
+    return lambda frame: StatsCube(frame, dataset_store.derived(dataset_id, 'filter_index', FilterIndex))
+
+
+@functools.lru_cache(maxsize=FILTER_CACHE_SIZE)
+def cube_selection(key):
+    """Return the StatsCube selection for a filter_key.
+
+    Returns None for match store datasets that are not loaded in this worker;
+    those are only filtered by the Parquet reader.
+    """
+    dataset_id, operators, game_types, maps, start_date, end_date = key
+    stored = store_dataset(dataset_id)
+    if stored is not None and dataset_id not in dataset_store:
+        return None
+    cube = dataset_store.derived(dataset_id, 'stats_cube', build_stats_cube(dataset_id))
+    if cube is None:
+        return None
+    selections = {'Operator': operators, 'Game Type': game_types, 'Map': maps}
+    return cube.select(selections, *date_range_times(start_date, end_date))
+
+PLOTS_GRID_STYLE = {
+    'display': 'grid',
+    'grid-template-columns': 'repeat(2, 1fr)',
+    'gap': '1rem',
+    'padding': '1rem',
+    'background': 'var(--bg-dark)',
+    'margin': '0 auto',
+    'max-width': '1150px'
+}
+PLOTS_GRID_HIDDEN = dict(PLOTS_GRID_STYLE, display='none')
+
+NO_CHARTS_STYLE = {'text-align': 'center',
+                   'padding': '20px',
+                   'color': 'var(--text-secondary)'}
+NO_CHARTS_HIDDEN = dict(NO_CHARTS_STYLE, display='none')
+
+
+def plots_content():
+    """Return the chart grid; its graphs stay in place and create_plots updates their figures."""
+    return html.Div([
+        dcc.Store(id='figure-shapes'),
+        html.Div("Select filters to display charts", id='plots-message', style=NO_CHARTS_STYLE),
+        html.Div([dcc.Graph(id=figure_id) for figure_id in FIGURES], id='plots-grid',
+                 style=PLOTS_GRID_HIDDEN)
+    ], id='plots-container')
+
+
+@instrumentation.callback('create_plots')
+def create_plots(operator, game_type, map_name, start_date, end_date, dataset_id, shapes=None):
+    """Return each graph's figure, then the figure shapes, grid style and message style.
+
+    shapes holds figure_shape of the figure each graph shows. A graph whose
+    new figure has the same shape is sent a Patch of the trace data only.
+    """
     date_range = (start_date, end_date)
-    filtered_data = get_filtered_data(operator, game_type, map_name, date_range)
-    
-    # Return message if no data after filtering
+    key = filter_key(dataset_id, operator, game_type, map_name, date_range)
+    filtered_data = None
+    aggregates = None
+    shapes = dict(shapes or {})
+
+    figures = []
+    for figure_id, build_figure in FIGURES.items():
+        # Repeated or undone filter states are served from the figure cache
+        figure = figure_cache.get((key, figure_id))
+        if figure is None:
+            if filtered_data is None:
+                filtered_data = get_filtered_data(dataset_id, operator, game_type, map_name, date_range)
+
+                # Show the message instead of the charts if no data after filtering
+                if filtered_data.empty:
+                    return (*[no_update] * len(FIGURES), no_update, PLOTS_GRID_HIDDEN, NO_CHARTS_STYLE)
+                aggregates = MatchAggregates(filtered_data, key, cube_selection(key))
+            with instrumentation.span(f'figure.{figure_id}', rows_in=len(filtered_data)):
+                figure = figure_cache.put((key, figure_id), build_figure(filtered_data, aggregates))
+
+        # Layout, template and trace styling are only sent when they change
+        shape = figure_shape(figure)
+        if shapes.get(figure_id) == shape:
+            figures.append(data_patch(figure))
+        else:
+            figures.append(figure)
+            shapes[figure_id] = shape
+    return (*figures, shapes, PLOTS_GRID_STYLE, NO_CHARTS_HIDDEN)
+
+
+if not CLIENTSIDE_FILTERING:
+    # Clientside mode has graphs of its own (see clientside_content)
+    callback(
+        [*[Output(figure_id, 'figure') for figure_id in FIGURES],
+         Output('figure-shapes', 'data'),
+         Output('plots-grid', 'style'),
+         Output('plots-message', 'style')],
+        [Input('operator-checklist', 'value'),
+         Input('game-type-checklist', 'value'),
+         Input('map-checklist', 'value'),
+         Input('date-range-picker', 'start_date'),
+         Input('date-range-picker', 'end_date'),
+         Input('dataset-id', 'data')],
+        State('figure-shapes', 'data')
+    )(create_plots)
+
+
+def zoom_window(relayout_data):
+    """Return the x range of a zoom event, None for a reset, or False otherwise."""
+    if not relayout_data:
+        return False
+    if relayout_data.get('xaxis.autorange'):
+        return None
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'][:2])
+    return False
+
+
+# A zoomed window with up to this many rows is drawn with every row; larger
+# windows are downsampled to this many points
+ZOOM_MAX_POINTS = int(os.environ.get('ZOOM_MAX_POINTS', 5000))
+
+
+def resample_time_series(figure_id, relayout_data, operator, game_type, map_name, start_date, end_date, dataset_id):
+    """Rebuild a time-series figure for the zoomed window.
+
+    Windows of up to ZOOM_MAX_POINTS rows are drawn at full resolution and
+    larger ones are downsampled to ZOOM_MAX_POINTS points. Returns the
+    figure and a Patch of the figure shapes that makes the next create_plots
+    send the graph a whole figure again.
+    """
+    window = zoom_window(relayout_data)
+    if window is False:
+        return no_update, no_update
+    date_range = (start_date, end_date)
+    filtered_data = get_filtered_data(dataset_id, operator, game_type, map_name, date_range)
     if filtered_data.empty:
-        return html.Div("Select filters to display charts", 
-                       style={'text-align': 'center', 
-                             'padding': '20px',
-                             'color': 'var(--text-secondary)'})
-    
-    # Calculate metrics with proper handling of edge cases
-    filtered_data['Accuracy'] = (filtered_data['Hits'] / filtered_data['Shots']).round(3)
-    filtered_data['Accuracy'] = filtered_data['Accuracy'].clip(0, 1)  # Limit to valid range
-    filtered_data['KD_Ratio'] = filtered_data.apply(
-        lambda row: row['Kills'] / row['Deaths'] if row['Deaths'] > 0 else row['Kills'],
-        axis=1
-    ).round(2)
-    # Extract time-based features
-    # Extract time-based features using local time
-    filtered_data['Hour'] = filtered_data['Local Time'].dt.hour
-    filtered_data['Day'] = filtered_data['Local Time'].dt.day_name()
-    
-    # Skill progression over time
-    skill_plot = px.line(
-        filtered_data,
-        x='Local Time',
-        y='Skill',
-        title="Skill Progression Over Time",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH,
-        color_discrete_sequence=['#5B9AFF']
-    )
-    skill_plot.update_traces(line_width=2)
-    skill_plot.update_layout(
-        template="plotly_dark",
-        xaxis_title='Time',
-        yaxis_title='Skill Rating'
-    )
-    
-    # KD ratio by hour as a bar chart with 12-hour format
-    hourly_data = filtered_data.groupby('Hour')['KD_Ratio'].mean().reset_index()
-    hourly_data['Hour_12'] = hourly_data['Hour'].apply(
-        lambda x: f"{x if 0 < x < 12 else 12 if x == 12 else x-12} {'AM' if x < 12 else 'PM'}"
-    )
-    kd_by_hour = px.bar(
-        hourly_data,
-        x='Hour_12',
-        y='KD_Ratio',
-        title="Average K/D Ratio by Hour",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH,
-        color_discrete_sequence=['#00ff00']
-    )
-    kd_by_hour.update_layout(
-        xaxis_title='Hour of Day',
-        yaxis_title='Average K/D Ratio',
-        template="plotly_dark",
-        xaxis_tickangle=45
-    )
-    
-    # Accuracy distribution
-    valid_accuracy = filtered_data[
-        (filtered_data['Accuracy'] >= 0) & 
-        (filtered_data['Accuracy'] <= 1) & 
-        (filtered_data['Shots'] > 0)
-    ]
-    accuracy_hist = px.histogram(
-        valid_accuracy,
-        x='Accuracy',
-        nbins=30,
-        title="Accuracy Distribution",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH,
-        color_discrete_sequence=['orange']
-    )
-    accuracy_hist.update_layout(
-        xaxis_title='Accuracy %',
-        yaxis_title='Number of Matches',
-        template="plotly_dark"
-    )
+        return no_update, no_update
+    shapes = Patch()
+    shapes[figure_id] = None
 
-    # K/D distribution
-    kd_hist = px.histogram(
-        filtered_data,
-        x='KD_Ratio',
-        nbins=30,
-        title="K/D Ratio Distribution",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH,
-        color_discrete_sequence=['red']
-    )
-    kd_hist.update_layout(
-        xaxis_title='K/D Ratio',
-        yaxis_title='Number of Matches',
-        template="plotly_dark"
-    )
+    # Reset zoom: back to the downsampled overview
+    if window is None:
+        key = (filter_key(dataset_id, operator, game_type, map_name, date_range), figure_id)
+        figure = figure_cache.get(key)
+        if figure is None:
+            figure = figure_cache.put(key, FIGURES[figure_id](filtered_data, None))
+        return figure, shapes
 
-    # Skill distribution
-    skill_hist = px.histogram(
-        filtered_data,
-        x='Skill',
-        nbins=30,
-        title="Skill Distribution",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH,
-        color_discrete_sequence=['cyan']
-    )
-    skill_hist.update_layout(
-        xaxis_title='Skill Rating',
-        yaxis_title='Number of Matches',
-        template="plotly_dark"
-    )
-    
-    # Performance metrics over time
-    metrics_plot = px.line(
-        filtered_data,
-        x='Local Time',
-        y=['KD_Ratio', 'Accuracy'],
-        title="Performance Metrics Over Time",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH
-    )
-    metrics_plot.update_traces(line_width=2)
-    metrics_plot.update_layout(template="plotly_dark")
-    
-    # Headshot ratio over time
-    filtered_data['Headshot_Ratio'] = (filtered_data['Headshots'] / filtered_data['Kills']).fillna(0)
-    headshot_plot = px.line(
-        filtered_data,
-        x='Local Time',
-        y='Headshot_Ratio',
-        title="Headshot Ratio Over Time",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH
-    )
-    headshot_plot.update_traces(line_color='#ff4d4d', line_width=2)
-    headshot_plot.update_layout(
-        yaxis_title='Headshot Ratio',
-        template="plotly_dark"
-    )
+    # Rows are sorted by time; keep one point past each edge so lines reach the border
+    local_tz = local_timezone()
+    times = filtered_data['Local Time']
+    start = times.searchsorted(pd.Timestamp(window[0]).tz_localize(local_tz), side='left')
+    end = times.searchsorted(pd.Timestamp(window[1]).tz_localize(local_tz), side='right')
+    visible = filtered_data.iloc[max(start - 1, 0):end + 1]
 
-    # Damage efficiency (damage done vs taken)
-    damage_plot = px.scatter(
-        filtered_data,
-        x='Damage Taken',
-        y='Damage Done',
-        title="Damage Efficiency",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH,
-        color='Match Outcome',
-        trendline="ols"
-    )
-    damage_plot.update_layout(
-        template="plotly_dark",
-        showlegend=True
-    )
+    figure = FIGURES[figure_id](visible, None, threshold=ZOOM_MAX_POINTS)
+    figure.update_xaxes(range=list(window))
+    return figure, shapes
 
-    # Match outcomes pie chart
-    outcome_stats = filtered_data['Match Outcome'].value_counts()
-    outcome_plot = px.pie(
-        values=outcome_stats.values,
-        names=outcome_stats.index,
-        title="Match Outcomes Distribution",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH,
-        color_discrete_sequence=px.colors.qualitative.Set3
-    )
-    outcome_plot.update_layout(template="plotly_dark")
 
-    # Map K/D performance
-    map_stats = (filtered_data.groupby('Map')
-                .agg({'Kills': 'sum', 'Deaths': 'sum'})
-                .reset_index())
-    
-    # Calculate KD ratio safely, replacing 0 deaths with 1
-    map_stats['KD'] = (map_stats['Kills'] / map_stats['Deaths'].replace(0, 1)).round(2)
-    
-    # Sort by KD ratio
-    map_stats = map_stats.sort_values('KD', ascending=True)
-    
-    map_performance = px.bar(
-        map_stats,
-        x='Map',
-        y='KD',
-        title="K/D Ratio by Map",
-        height=PLOT_HEIGHT,
-        width=PLOT_WIDTH,
-        color_discrete_sequence=['purple']
-    )
-    map_performance.update_layout(
-        xaxis_title='Map',
-        yaxis_title='K/D Ratio',
-        template="plotly_dark",
-        xaxis_tickangle=45
+def register_resample_callback(figure_id):
+    @callback(
+        [Output(figure_id, 'figure', allow_duplicate=True),
+         Output('figure-shapes', 'data', allow_duplicate=True)],
+        Input(figure_id, 'relayoutData'),
+        [State('operator-checklist', 'value'),
+         State('game-type-checklist', 'value'),
+         State('map-checklist', 'value'),
+         State('date-range-picker', 'start_date'),
+         State('date-range-picker', 'end_date'),
+         State('dataset-id', 'data')],
+        prevent_initial_call=True
     )
-    
-    # Create Dash graph components
-    plots = [
-        dcc.Graph(figure=skill_plot, id='skill-plot'),
-        dcc.Graph(figure=kd_by_hour, id='kd-by-hour-plot'),
-        dcc.Graph(figure=accuracy_hist, id='accuracy-hist'),
-        dcc.Graph(figure=kd_hist, id='kd-hist'),
-        dcc.Graph(figure=skill_hist, id='skill-hist'),
-        dcc.Graph(figure=metrics_plot, id='metrics-plot'),
-        dcc.Graph(figure=map_performance, id='map-performance'),
-        dcc.Graph(figure=headshot_plot, id='headshot-plot'),
-        dcc.Graph(figure=damage_plot, id='damage-plot'),
-        dcc.Graph(figure=outcome_plot, id='outcome-plot')
-    ]
-    
-    # Create activity heatmap
-    activity_df = filtered_data.groupby(['Day', 'Hour']).size().reset_index(name='Count')
-    activity_pivot = activity_df.pivot(index='Day', columns='Hour', values='Count').fillna(0)
-    
-    # Reorder days to start with Monday
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    activity_pivot = activity_pivot.reindex(day_order)
-    
-    # Convert hour numbers to 12-hour format for heatmap
-    hour_labels = [f"{h if 0 < h < 12 else 12 if h == 12 else h-12} {'AM' if h < 12 else 'PM'}" 
-                  for h in activity_pivot.columns]
-    
-    activity_heatmap = go.Figure(data=go.Heatmap(
-        z=activity_pivot.values,
-        x=hour_labels,
-        y=activity_pivot.index,
-        colorscale='Viridis',
-        hoverongaps=False
-    ))
-    
-    activity_heatmap.update_layout(
-        title='Gaming Activity Heatmap',
-        xaxis_title='Hour of Day',
-        yaxis_title='Day of Week',
-        height=400,
-        template="plotly_dark",
-        xaxis_tickangle=45
-    )
-    
-    # Add activity heatmap to plots list
-    plots.append(dcc.Graph(figure=activity_heatmap, id='activity-heatmap'))
-    
-    # Create responsive grid layout using Dash
-    layout = html.Div(
-        plots,
-        style={
-            'display': 'grid',
-            'grid-template-columns': 'repeat(2, 1fr)',
-            'gap': '1rem',
-            'padding': '1rem',
-            'background': 'var(--bg-dark)',
-            'margin': '0 auto',
-            'max-width': '1150px'
-        }
-    )
-    return layout
+    def resample(relayout_data, *filters):
+        return resample_time_series(figure_id, relayout_data, *filters)
+
+
+for time_series_id in TIME_SERIES_FIGURES:
+    register_resample_callback(time_series_id)
 
 # Create stats cards
 @callback(
@@ -393,53 +503,50 @@ def create_plots(operator, game_type, map_name, start_date, end_date):
      Input('game-type-checklist', 'value'),
      Input('map-checklist', 'value'),
      Input('date-range-picker', 'start_date'),
-     Input('date-range-picker', 'end_date')]
+     Input('date-range-picker', 'end_date'),
+     Input('dataset-id', 'data')]
 )
-def create_stats(operator, game_type, map_name, start_date, end_date):
+@instrumentation.callback('create_stats')
+def create_stats(operator, game_type, map_name, start_date, end_date, dataset_id):
     date_range = (start_date, end_date)
-    filtered_data = get_filtered_data(operator, game_type, map_name, date_range)
-    
+
     # Return empty stats if no data is loaded
-    if data.empty:
-        return html.Div([
-            dbc.Card([
-                dbc.CardBody([
-                    html.H3("No Data Loaded", 
-                           className="text-center mb-4",
-                           style={'color': 'var(--accent-color)', 'fontSize': '1.4rem'}),
-                    html.Div("Please load data using the upload button or example data button above.",
-                            className="text-center",
-                            style={'color': 'var(--text-secondary)'})
-                ])
-            ], className="stats-card mb-4")
-        ])
+    if not has_dataset(dataset_id):
+        return no_data_card()
 
-    # Calculate stats from filtered data
-    total_kills = filtered_data['Kills'].sum() if not filtered_data.empty else 0
-    total_deaths = filtered_data['Deaths'].sum() if not filtered_data.empty else 0
-    kd_ratio = round(total_kills / (total_deaths or 1), 2)  # Use 1 if total_deaths is 0
-    total_wins = filtered_data['Match Outcome'].str.lower().str.contains('win').sum() if not filtered_data.empty else 0
-    total_games = len(filtered_data)
-    win_rate = round((total_wins / (total_games or 1)) * 100, 1)  # Use 1 if total_games is 0
-    total_shots = filtered_data['Shots'].sum() if not filtered_data.empty else 0
-    total_hits = filtered_data['Hits'].sum() if not filtered_data.empty else 0
-    accuracy = round((total_hits / (total_shots or 1)) * 100, 1)  # Use 1 if total_shots is 0
-    avg_score = int(round(filtered_data['Score'].mean(), 0)) if not filtered_data.empty else 0
-    
-    # Calculate total time played from match timestamps
-    if not filtered_data.empty:
-        match_durations = (filtered_data['Match End Timestamp'] - filtered_data['Match Start Timestamp'])
-        total_seconds = int(match_durations.dt.total_seconds().sum())
-    else:
-        total_seconds = 0
-    
-    # Format total time
-    days = total_seconds // (24 * 60 * 60)
-    remaining_seconds = total_seconds % (24 * 60 * 60)
-    hours = remaining_seconds // (60 * 60)
-    minutes = (remaining_seconds % (60 * 60)) // 60
-    total_time = f"{days}d {hours}h {minutes}m"
-    
+    # Every stat is a sum or maximum over matches, so the loaded dataset's
+    # cube answers them without filtering rows
+    selection = None
+    if operator and game_type and map_name:
+        selection = cube_selection(filter_key(dataset_id, operator, game_type, map_name, date_range))
+    with instrumentation.span('compute_stats') as span:
+        if selection is not None:
+            stats = stats_from_totals(selection.totals())
+            span.update(rows_in=len(selection.rows), cells=len(selection.cells))
+        else:
+            filtered_data = get_filtered_data(dataset_id, operator, game_type, map_name, date_range)
+            stats = compute_stats(filtered_data)
+            span['rows_in'] = len(filtered_data)
+    return stats_cards(stats)
+
+
+def no_data_card():
+    return html.Div([
+        dbc.Card([
+            dbc.CardBody([
+                html.H3("No Data Loaded", 
+                       className="text-center mb-4",
+                       style={'color': 'var(--accent-color)', 'fontSize': '1.4rem'}),
+                html.Div("Please load data using the upload button or example data button above.",
+                        className="text-center",
+                        style={'color': 'var(--text-secondary)'})
+            ])
+        ], className="stats-card mb-4")
+    ])
+
+
+def stats_cards(stats):
+    """Lay out the stats cards for a compute_stats dict."""
     # Create two cards: one for lifetime stats and one for filtered stats
     lifetime_card = dbc.Card([
         dbc.CardBody([
@@ -451,25 +558,25 @@ def create_stats(operator, game_type, map_name, start_date, end_date):
                 dbc.Col([
                     html.Div([
                         html.Strong("Total K/D"),
-                        html.Div(f"{kd_ratio}")
+                        html.Div(f"{stats['kd_ratio']}")
                     ], className="text-center mb-3")
                 ]),
                 dbc.Col([
                     html.Div([
                         html.Strong("Overall Win Rate"),
-                        html.Div(f"{win_rate}%")
+                        html.Div(f"{stats['win_rate']}%")
                     ], className="text-center mb-3")
                 ]),
                 dbc.Col([
                     html.Div([
                         html.Strong("Lifetime Accuracy"),
-                        html.Div(f"{accuracy}%")
+                        html.Div(f"{stats['accuracy']}%")
                     ], className="text-center mb-3")
                 ]),
                 dbc.Col([
                     html.Div([
                         html.Strong("Total Play Time"),
-                        html.Div(f"{total_time}")
+                        html.Div(f"{stats['total_time']}")
                     ], className="text-center mb-3")
                 ]),
             ])
@@ -477,24 +584,13 @@ def create_stats(operator, game_type, map_name, start_date, end_date):
     ], className="stats-card mb-4")
 
     # Return message if no data after filtering
-    if filtered_data.empty:
+    if not stats['matches']:
         empty_card = html.Div("Select filters to display statistics", 
                        style={'text-align': 'center', 
                              'padding': '20px',
                              'color': 'var(--text-secondary)'})
         return html.Div([lifetime_card, empty_card])
 
-    # Calculate filtered-specific stats
-    filtered_avg_skill = round(filtered_data['Skill'].mean(), 2)
-    filtered_kills = filtered_data['Kills'].sum()
-    filtered_deaths = filtered_data['Deaths'].sum()
-    filtered_kd = round(filtered_kills / (filtered_deaths or 1), 2)
-    filtered_wins = filtered_data['Match Outcome'].str.lower().str.contains('win').sum()
-    filtered_total = len(filtered_data)
-    filtered_winrate = round((filtered_wins / (filtered_total or 1)) * 100, 1)  # Use 1 if filtered_total is 0
-    filtered_accuracy = round((filtered_data['Hits'].sum() / filtered_data['Shots'].sum()) * 100, 1)
-    filtered_streak = int(filtered_data['Longest Streak'].max())
-    
     filtered_card = dbc.Card([
         dbc.CardBody([
             html.H3("Filtered Performance", 
@@ -505,25 +601,25 @@ def create_stats(operator, game_type, map_name, start_date, end_date):
                 dbc.Col([
                     html.Div([
                         html.Strong("Avg Skill Rating"),
-                        html.Div(f"{filtered_avg_skill}")
+                        html.Div(f"{stats['avg_skill']}")
                     ], className="text-center mb-3")
                 ]),
                 dbc.Col([
                     html.Div([
                         html.Strong("Filtered K/D"),
-                        html.Div(f"{filtered_kd}")
+                        html.Div(f"{stats['kd_ratio']}")
                     ], className="text-center mb-3")
                 ]),
                 dbc.Col([
                     html.Div([
                         html.Strong("Win Rate"),
-                        html.Div(f"{filtered_winrate}%")
+                        html.Div(f"{stats['win_rate']}%")
                     ], className="text-center mb-3")
                 ]),
                 dbc.Col([
                     html.Div([
                         html.Strong("Accuracy"),
-                        html.Div(f"{filtered_accuracy}%")
+                        html.Div(f"{stats['accuracy']}%")
                     ], className="text-center mb-3")
                 ]),
             ]),
@@ -532,13 +628,13 @@ def create_stats(operator, game_type, map_name, start_date, end_date):
                 dbc.Col([
                     html.Div([
                         html.Strong("Best Streak"),
-                        html.Div(f"{filtered_streak}")
+                        html.Div(f"{stats['best_streak']}")
                     ], className="text-center")
                 ]),
                 dbc.Col([
                     html.Div([
                         html.Strong("Matches"),
-                        html.Div(f"{filtered_total}")
+                        html.Div(f"{stats['matches']}")
                     ], className="text-center")
                 ]),
             ])
@@ -558,8 +654,23 @@ def create_stats(operator, game_type, map_name, start_date, end_date):
     ])
 
 
+def clientside_content():
+    """Return the stats and chart containers that clientside mode fills in the browser."""
+    return [
+        dcc.Store(id='client-data'),
+        html.Div(no_data_card(), id='client-stats-container'),
+        html.Hr(style={'margin': '20px 0'}),
+        html.Div([dcc.Graph(id=figure_id) for figure_id in FIGURES
+                  if figure_id in CLIENT_FIGURES or figure_id in SERVER_FIGURES], style=PLOTS_GRID_STYLE),
+    ]
+
+
 # Define the app layout
 app.layout = dbc.Container([
+    dcc.Store(id='dataset-id'),
+    dcc.Store(id='upload-handle'),
+    # What a background ingest hands back to the server process
+    dcc.Store(id='ingest-result'),
     dbc.Row([
         # File upload
         dbc.Col([
@@ -576,11 +687,14 @@ app.layout = dbc.Container([
             html.Div("- or -", 
                     className="text-center mb-3",
                     style={'color': 'var(--text-secondary)'}),
-            dcc.Upload(
-                id='upload-data',
+            # Files dropped here or picked with the button are sent to the
+            # /upload route by assets/chunked_upload.js, which then sets
+            # 'upload-handle'
+            html.Div(
+                id='upload-drop-zone',
                 children=html.Div([
                     'Drag and Drop or ',
-                    dbc.Button('Select HTML File', color="primary", size="sm", className="ms-2")
+                    dbc.Button('Select HTML File', id='upload-select', color="primary", size="sm", className="ms-2")
                 ]),
                 style={
                     'width': '100%',
@@ -591,8 +705,22 @@ app.layout = dbc.Container([
                     'borderRadius': '5px',
                     'textAlign': 'center',
                     'margin': '10px 0'
-                },
-                multiple=False
+                }
+            ),
+            html.Div(id='upload-progress', style={'color': 'var(--text-secondary)'}),
+            # Shown while update_data runs in the background
+            html.Div([
+                dbc.Progress(id='ingest-progress', value=0, className="mb-2"),
+                html.Div([
+                    html.Span(id='ingest-status', style={'color': 'var(--text-secondary)'}),
+                    dbc.Button('Cancel', id='cancel-ingest', color="secondary", size="sm", className="ms-2")
+                ])
+            ], id='ingest-panel', style={'display': 'none'}, className="mb-2"),
+            dbc.Checkbox(
+                id='merge-upload',
+                label='Add only new matches to the loaded data',
+                value=False,
+                className="mb-2"
             ),
             dcc.Loading(
                 id="loading-upload",
@@ -624,9 +752,12 @@ app.layout = dbc.Container([
         
         # Main content
         dbc.Col([
-            html.Div(id='stats-container'),
-            html.Hr(style={'margin': '20px 0'}),
-            html.Div(id='plots-container')
+            *(clientside_content() if CLIENTSIDE_FILTERING else [
+                html.Div(id='stats-container'),
+                html.Hr(style={'margin': '20px 0'}),
+                plots_content(),
+            ]),
+            *([debug_panel(instrumentation)] if instrumentation.enabled else [])
         ], width=9, style={
             'background': 'var(--bg-dark)',
             'padding': '20px'
@@ -687,9 +818,39 @@ def map_select_all(select_clicks, deselect_clicks, options):
     return []
 
 
-# Combined callback for file upload, example data, and date picker
+def ingest_progress(set_progress, total_bytes):
+    """Return a parse_html_stream progress callback that reports to the ingest panel."""
+    def report(rows, position):
+        set_progress((100 * position / (total_bytes or 1),
+                      f"Parsed {rows:,} matches ({position / 1e6:,.1f} of {total_bytes / 1e6:,.1f} MB)"))
+    return report
+
+
+# Fill in a cleared start or end date with the loaded data's range
 @callback(
-    [Output('upload-status', 'children'),
+    [Output('date-range-picker', 'start_date', allow_duplicate=True),
+     Output('date-range-picker', 'end_date', allow_duplicate=True)],
+    [Input('date-range-picker', 'start_date'),
+     Input('date-range-picker', 'end_date')],
+    State('dataset-id', 'data'),
+    prevent_initial_call=True
+)
+def fill_date_range(start_date, end_date, current_dataset_id):
+    if start_date is not None and end_date is not None:
+        return no_update, no_update
+    data = get_dataset_columns(current_dataset_id, ['Local Time'])
+    if data.empty:
+        return start_date, end_date
+    if start_date is None:
+        start_date = data['Local Time'].min().replace(tzinfo=None)
+    if end_date is None:
+        end_date = data['Local Time'].max().replace(tzinfo=None)
+    return start_date, end_date
+
+
+# Combined callback for file upload and example data
+UPDATE_DATA_DEPENDENCIES = dict(
+    output=[Output('upload-status', 'children'),
      Output('operator-checklist', 'options'),
      Output('game-type-checklist', 'options'),
      Output('map-checklist', 'options'),
@@ -700,34 +861,30 @@ def map_select_all(select_clicks, deselect_clicks, options):
      Output('operator-checklist', 'value', allow_duplicate=True),
      Output('game-type-checklist', 'value', allow_duplicate=True),
      Output('map-checklist', 'value', allow_duplicate=True),
-     Output('upload-data', 'contents')],
-    [Input('upload-data', 'contents'),
-     Input('load-example-data', 'n_clicks'),
-     Input('date-range-picker', 'start_date'),
-     Input('date-range-picker', 'end_date')],
-    [State('upload-data', 'filename')],
+     Output('upload-handle', 'data'),
+     Output('dataset-id', 'data')],
+    inputs=[Input('upload-handle', 'data'),
+            Input('load-example-data', 'n_clicks')],
+    state=[State('dataset-id', 'data'),
+           State('merge-upload', 'value')],
     prevent_initial_call=True
 )
-def update_data(contents, example_clicks, start_date, end_date, filename):
-    global data
+
+
+@instrumentation.callback('update_data')
+def update_data(set_progress, upload, example_clicks, current_dataset_id, merge_upload=False):
+    """Load an upload or the example data; set_progress is None when run inline."""
     ctx = callback_context
     triggered_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
-    
-    # Handle date picker updates
-    if triggered_id in ['date-range-picker']:
-        if start_date is None:
-            start_date = data['Local Time'].min().replace(tzinfo=None)
-        if end_date is None:
-            end_date = data['Local Time'].max().replace(tzinfo=None)
-        return no_update, no_update, no_update, no_update, no_update, no_update, start_date, end_date, no_update, no_update, no_update, None
-
-    # Reset data before processing new data
-    data = pd.DataFrame()
+    if set_progress is None:
+        set_progress = lambda progress: None
 
     # Handle example data loading
     if triggered_id == 'load-example-data' and example_clicks is not None:
+        set_progress((0, "Loading example data"))
         try:
-            data = pd.read_csv('data2.csv')
+            with open('data2.csv', 'rb') as f:
+                dataset_id, data, cached = load_dataset(f.read(), read_csv)
             success_message = 'Example data loaded successfully'
         except Exception as e:
             return (
@@ -736,23 +893,43 @@ def update_data(contents, example_clicks, start_date, end_date, filename):
                     'Error loading example data: ',
                     html.Pre(str(e))
                 ]),
-                [], [], [], None, None, None, None, [], [], [], None
+                [], [], [], None, None, None, None, [], [], [], None, None
             )
     
     # Handle file upload
-    elif triggered_id == 'upload-data':
-        if contents is None:
-            return html.Div(), [], [], [], None, None, None, None, [], [], []
-            
+    elif triggered_id == 'upload-handle':
+        if upload is None:
+            return html.Div(), [], [], [], None, None, None, None, [], [], [], None, None
+
+        # The export is parsed straight from the uploaded file on disk
+        upload_id = upload['upload_id']
         try:
-            content_type, content_string = contents.split(',')
-            decoded = base64.b64decode(content_string)
-            
-            if 'html' in filename.lower():
-                data = parse_html_file(decoded.decode('utf-8'))
-                success_message = f'Successfully loaded {filename}'
-            else:
+            info = upload_store.info(upload_id)
+        except KeyError:
+            return (
+                html.Div([
+                    html.I(className="fas fa-exclamation-circle", style={'color': 'red', 'marginRight': '10px'}),
+                    'Upload not found, please select the file again'
+                ]),
+                [], [], [], None, None, None, None, [], [], [], None, None
+            )
+        try:
+            filename = info['filename']
+            if 'html' not in filename.lower():
                 raise ValueError("Please upload an HTML file")
+            if not upload_store.complete(upload_id):
+                raise ValueError(f"Upload of {filename} is incomplete")
+            progress = ingest_progress(set_progress, info['size'])
+            with upload_store.open(upload_id) as f:
+                if merge_upload and match_store is not None and has_dataset(current_dataset_id):
+                    dataset_id, added = ingest_incremental(current_dataset_id, f, progress)
+                    data = get_dataset_columns(dataset_id, ['Operator', 'Game Type', 'Map', 'Local Time'])
+                    cached = False
+                    success_message = f'Added {added} new matches from {filename}'
+                else:
+                    parse = functools.partial(parse_html_stream, progress=progress)
+                    dataset_id, data, cached = load_dataset(f, parse, upload_store.digest(upload_id))
+                    success_message = f'Successfully loaded {filename}'
         except Exception as e:
             return (
                 html.Div([
@@ -760,29 +937,15 @@ def update_data(contents, example_clicks, start_date, end_date, filename):
                     'Error processing file: ',
                     html.Pre(str(e))
                 ]),
-                [], [], [], None, None, None, None, [], [], [], None
+                [], [], [], None, None, None, None, [], [], [], None, None
             )
+        finally:
+            upload_store.remove(upload_id)
     else:
-        return html.Div(), [], [], [], None, None, None, None, [], [], [], None
-
-    # Apply common data processing
-    # Filter out unwanted game types
-    data = data[data['Game Type'] != 'Pentathlon Hint (TDM Example: Eliminate the other team or be holding the flag when time runs out.)']
-    data = data[data['Game Type'] != 'Training Course']
-    data = data[data['Game Type'] != 'Ran-snack']
-    data = data[data['Game Type'] != 'Stop and Go']
-    data = data[data['Game Type'] != 'Red Light Green Light']
-    data = data[data['Game Type'] != 'Prop Hunt']
-    
-    # Convert timestamps and timezone
-    timestamp_columns = ['UTC Timestamp', 'Match Start Timestamp', 'Match End Timestamp']
-    for col in timestamp_columns:
-        if col in data.columns:
-            data[col] = pd.to_datetime(data[col])
-            data[col] = data[col].dt.tz_localize('UTC')
-    
-    local_tz = datetime.datetime.now().astimezone().tzinfo
-    data['Local Time'] = data['UTC Timestamp'].dt.tz_convert(local_tz)
+        return html.Div(), [], [], [], None, None, None, None, [], [], [], None, None
+
+    if cached:
+        success_message += ' (from cache)'
     
     # Update filter options
     operator_options = [{"label": opt, "value": opt} for opt in sorted(data['Operator'].unique())]
@@ -813,9 +976,173 @@ def update_data(contents, example_clicks, start_date, end_date, filename):
         operator_values,
         game_type_values,
         map_values,
-        None
+        None,
+        dataset_id
     )
 
+if background_callback_manager is not None:
+    def update_data_background(set_progress, *args):
+        # The job runs in a child process, so its instrumentation records and
+        # the dataset it loaded would go with it; record_ingest takes them up
+        # in the server process from 'ingest-result'
+        with instrumentation.collect() as records:
+            outputs = update_data(set_progress, *args)
+        return (*outputs, {'dataset_id': outputs[-1], 'records': records})
+
+    @callback(Input('ingest-result', 'data'), prevent_initial_call=True)
+    def record_ingest(result):
+        """Replay a background ingest's timings and load its dataset in this process."""
+        if not result:
+            return
+        instrumentation.replay(result['records'])
+        if result['dataset_id'] is not None:
+            has_dataset(result['dataset_id'])
+
+    # The upload file outlives a cancelled ingest until UploadStore evicts it
+    callback(**dict(UPDATE_DATA_DEPENDENCIES,
+                    output=UPDATE_DATA_DEPENDENCIES['output'] + [Output('ingest-result', 'data')]),
+             background=True,
+             manager=background_callback_manager,
+             progress=[Output('ingest-progress', 'value'),
+                       Output('ingest-status', 'children')],
+             cancel=[Input('cancel-ingest', 'n_clicks')],
+             running=[(Output('ingest-panel', 'style'), {'display': 'block'}, {'display': 'none'})]
+             )(update_data_background)
+else:
+    @callback(**UPDATE_DATA_DEPENDENCIES)
+    def update_data_inline(*args):
+        return update_data(None, *args)
+
+if instrumentation.enabled:
+    register_debug_callbacks(instrumentation)
+
+instrumentation.gauge('figure_cache_hits_total', 'Figure cache hits.', lambda: figure_cache.hits, 'counter')
+instrumentation.gauge('figure_cache_misses_total', 'Figure cache misses.', lambda: figure_cache.misses, 'counter')
+instrumentation.gauge('figure_cache_bytes', 'Serialised size of cached figures.', lambda: figure_cache.nbytes)
+instrumentation.gauge('filter_cache_hits_total', 'Filter result cache hits.',
+                      lambda: filter_dataset.cache_info().hits, 'counter')
+instrumentation.gauge('filter_cache_misses_total', 'Filter result cache misses.',
+                      lambda: filter_dataset.cache_info().misses, 'counter')
+instrumentation.gauge('dataset_cache_hits_total', 'Dataset cache hits.', lambda: dataset_cache.hits, 'counter')
+instrumentation.gauge('dataset_cache_misses_total', 'Dataset cache misses.', lambda: dataset_cache.misses, 'counter')
+instrumentation.gauge('loaded_datasets', 'Datasets loaded in this worker.', lambda: len(dataset_store))
+instrumentation.gauge('loaded_dataset_bytes', 'Memory used by loaded datasets.', lambda: dataset_store.nbytes)
+
+
+def client_payload(frame):
+    """Build the clientside mode payload of a loaded dataset."""
+    # Cards are sent with '{stat}' placeholders that the browser fills in
+    placeholders = {name: '{%s}' % name for name in compute_stats(frame)}
+    cards = {'full': to_json_data(stats_cards(placeholders)),
+             'empty': to_json_data(stats_cards(dict(placeholders, matches=0)))}
+    return encode_dataset(frame, figure_templates(frame), cards)
+
+
+if CLIENTSIDE_FILTERING:
+    @callback(
+        Output('client-data', 'data'),
+        Input('dataset-id', 'data')
+    )
+    def send_client_data(dataset_id):
+        # Built once per dataset; None (no data loaded) leaves the charts as they are
+        return dataset_store.derived(dataset_id, 'client_payload', client_payload)
+
+    @callback(
+        [Output(figure_id, 'figure') for figure_id in SERVER_FIGURES],
+        [Input('operator-checklist', 'value'),
+         Input('game-type-checklist', 'value'),
+         Input('map-checklist', 'value'),
+         Input('date-range-picker', 'start_date'),
+         Input('date-range-picker', 'end_date'),
+         Input('dataset-id', 'data')]
+    )
+    @instrumentation.callback('create_server_plots')
+    def create_server_plots(operator, game_type, map_name, start_date, end_date, dataset_id):
+        """Return the SERVER_FIGURES clientside mode does not draw in the browser."""
+        date_range = (start_date, end_date)
+        key = filter_key(dataset_id, operator, game_type, map_name, date_range)
+        filtered_data = None
+        figures = []
+        for figure_id in SERVER_FIGURES:
+            figure = figure_cache.get((key, figure_id))
+            if figure is None:
+                if filtered_data is None:
+                    filtered_data = get_filtered_data(dataset_id, operator, game_type, map_name, date_range)
+                    if filtered_data.empty:
+                        return [empty_figure()] * len(SERVER_FIGURES)
+                    aggregates = MatchAggregates(filtered_data, key, cube_selection(key))
+                figure = figure_cache.put((key, figure_id), FIGURES[figure_id](filtered_data, aggregates))
+            figures.append(figure)
+        return figures
+
+    app.clientside_callback(
+        ClientsideFunction('matchFilter', 'update'),
+        [Output('client-stats-container', 'children'),
+         *[Output(figure_id, 'figure') for figure_id in CLIENT_FIGURES]],
+        [Input('operator-checklist', 'value'),
+         Input('game-type-checklist', 'value'),
+         Input('map-checklist', 'value'),
+         Input('date-range-picker', 'start_date'),
+         Input('date-range-picker', 'end_date'),
+         Input('client-data', 'data')]
+    )
+
+
+def upload_error(message, status, **fields):
+    return jsonify(error=message, **fields), status
+
+
+@app.server.route('/upload', methods=['POST'])
+def start_upload():
+    """Start a chunked upload from JSON {filename, size}; returns its ID and chunk size."""
+    body = request.get_json(silent=True) or {}
+    filename = str(body.get('filename', ''))
+    if 'html' not in filename.lower():
+        return upload_error("Please upload an HTML file", 400)
+    try:
+        upload_id = upload_store.start(filename, int(body.get('size')))
+    except (TypeError, ValueError) as e:
+        return upload_error(str(e), 400)
+    return jsonify(upload_id=upload_id, offset=0, chunk_size=UPLOAD_CHUNK_BYTES)
+
+
+@app.server.route('/upload/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    """Report how much of an upload has arrived, for resuming it."""
+    try:
+        info = upload_store.info(upload_id)
+    except KeyError:
+        return upload_error("Unknown upload", 404)
+    return jsonify(upload_id=upload_id, offset=info['offset'], size=info['size'],
+                   chunk_size=UPLOAD_CHUNK_BYTES)
+
+
+@app.server.route('/upload/<upload_id>', methods=['PATCH'])
+def upload_chunk(upload_id):
+    """Append the request body at the Upload-Offset header's offset.
+
+    The body is copied to disk as it is read, so a chunk is never held in
+    memory whole. A 409 response carries the offset to resume from.
+    """
+    if (request.content_length or 0) > UPLOAD_CHUNK_BYTES:
+        return upload_error(f"Chunks are limited to {UPLOAD_CHUNK_BYTES} bytes", 413)
+    try:
+        info = upload_store.info(upload_id)
+        offset = upload_store.write(upload_id, int(request.headers.get('Upload-Offset', -1)),
+                                    request.stream)
+    except KeyError:
+        return upload_error("Unknown upload", 404)
+    except ValueError as e:
+        return upload_error(str(e), 409, offset=upload_store.info(upload_id)['offset'])
+    return jsonify(upload_id=upload_id, offset=offset, size=info['size'])
+
+
+@app.server.route('/metrics')
+def metrics():
+    """Per-worker stage timings and cache counters for Prometheus to scrape."""
+    return Response(instrumentation.metrics_text(), mimetype='text/plain; version=0.0.4')
+
+
 # Mount the app to the container
 app.clientside_callback(
     """
@@ -0,0 +1,134 @@
+// Streams the export picked with #upload-select (or dropped on
+// #upload-drop-zone) to the server's /upload route in chunks, then hands
+// the upload ID to update_data through the 'upload-handle' store.
+//
+// Uploads are resumable: the upload ID is remembered per file, so picking
+// the same file again after a dropped connection or a reload continues
+// from the last chunk the server has.
+(function () {
+    const RETRIES = 5;
+    const STORAGE_PREFIX = 'chunked-upload:';
+
+    function routePrefix() {
+        const config = document.getElementById('_dash-config');
+        const prefix = config ? JSON.parse(config.textContent).requests_pathname_prefix : '/';
+        return `${prefix || '/'}upload`;
+    }
+
+    function setProps(id, props) {
+        window.dash_clientside.set_props(id, props);
+    }
+
+    function fileKey(file) {
+        return `${STORAGE_PREFIX}${file.name}:${file.size}:${file.lastModified}`;
+    }
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    async function request(url, options) {
+        const response = await fetch(url, options);
+        const body = await response.json().catch(() => ({}));
+        return {status: response.status, ok: response.ok, body};
+    }
+
+    // Returns the server's state for a remembered upload of this file, or
+    // starts a new one
+    async function openUpload(file) {
+        const remembered = window.localStorage.getItem(fileKey(file));
+        if (remembered) {
+            const status = await request(`${routePrefix()}/${remembered}`);
+            if (status.ok && status.body.size === file.size) {
+                return status.body;
+            }
+        }
+        const started = await request(routePrefix(), {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({filename: file.name, size: file.size})
+        });
+        if (!started.ok) {
+            throw new Error(started.body.error || `Upload failed (${started.status})`);
+        }
+        window.localStorage.setItem(fileKey(file), started.body.upload_id);
+        return started.body;
+    }
+
+    async function sendChunks(file, upload, onProgress) {
+        const url = `${routePrefix()}/${upload.upload_id}`;
+        let offset = upload.offset;
+        let failures = 0;
+        onProgress(offset);
+        while (offset < file.size) {
+            let sent;
+            try {
+                sent = await request(url, {
+                    method: 'PATCH',
+                    headers: {'Content-Type': 'application/octet-stream', 'Upload-Offset': String(offset)},
+                    body: file.slice(offset, offset + upload.chunk_size)
+                });
+            } catch (error) {
+                sent = {ok: false, status: 0, body: {}};
+            }
+            if (sent.ok || sent.status === 409) {
+                // 409 means the server has a different offset; resume from it
+                offset = sent.body.offset;
+                failures = sent.ok ? 0 : failures + 1;
+                onProgress(offset);
+            } else if (sent.status === 0 || sent.status >= 500) {
+                failures++;
+                await sleep(500 * 2 ** failures);
+            } else {
+                throw new Error(sent.body.error || `Upload failed (${sent.status})`);
+            }
+            if (failures > RETRIES) {
+                throw new Error('Upload interrupted, select the file again to resume');
+            }
+        }
+    }
+
+    async function uploadFile(file) {
+        const showProgress = offset => setProps('upload-progress', {
+            children: `Uploading ${file.name}: ${Math.floor(offset / (file.size || 1) * 100)}%`
+        });
+        try {
+            const upload = await openUpload(file);
+            await sendChunks(file, upload, showProgress);
+            window.localStorage.removeItem(fileKey(file));
+            setProps('upload-progress', {children: ''});
+            setProps('upload-handle', {data: {upload_id: upload.upload_id}});
+        } catch (error) {
+            setProps('upload-progress', {children: error.message});
+        }
+    }
+
+    document.addEventListener('click', event => {
+        if (event.target.closest && event.target.closest('#upload-select')) {
+            const input = document.createElement('input');
+            input.type = 'file';
+            input.accept = '.html,.htm,text/html';
+            input.addEventListener('change', () => {
+                if (input.files.length) {
+                    uploadFile(input.files[0]);
+                }
+            });
+            input.click();
+        }
+    });
+
+    document.addEventListener('dragover', event => {
+        if (event.target.closest && event.target.closest('#upload-drop-zone')) {
+            event.preventDefault();
+        }
+    });
+
+    document.addEventListener('drop', event => {
+        if (event.target.closest && event.target.closest('#upload-drop-zone')) {
+            event.preventDefault();
+            if (event.dataTransfer.files.length) {
+                uploadFile(event.dataTransfer.files[0]);
+            }
+        }
+    });
+})();
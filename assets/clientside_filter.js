@@ -0,0 +1,322 @@
+// Clientside filtering (CLIENTSIDE_FILTERING=1, see client_payload.py).
+//
+// The dataset arrives once per load as typed columns in the 'client-data'
+// store. Every filter change is then answered here: the selected rows are
+// found with the same rules as FilterIndex.select, and the stats cards and
+// the histogram and aggregate figures are recomputed as stats.py,
+// aggregates.py and figures.py do, filling templates the server drew from the
+// full dataset. The damage scatter is still drawn by the server
+// (client_payload.SERVER_FIGURES) and the time-series charts are not shown.
+(function () {
+    const TYPES = {
+        int8: Int8Array, uint8: Uint8Array, int16: Int16Array, int32: Int32Array,
+        uint32: Uint32Array, float32: Float32Array
+    };
+    const HISTOGRAM_BINS = 30;
+    const decoded = new WeakMap();
+
+    function decodeArray({dtype, data}) {
+        const binary = atob(data);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return new TYPES[dtype](bytes.buffer);
+    }
+
+    // Columns are decoded once per payload
+    function decode(payload) {
+        let columns = decoded.get(payload);
+        if (!columns) {
+            columns = {};
+            for (const [name, column] of Object.entries(payload.columns)) {
+                columns[name] = decodeArray(column);
+            }
+            decoded.set(payload, columns);
+        }
+        return columns;
+    }
+
+    const MISSING_TIME = 0xFFFFFFFF;
+
+    // Date picker values are wall-clock times like 'Local Time'; returns
+    // seconds after timeBase, or null for no date
+    function wallSeconds(value, timeBase) {
+        if (!value) {
+            return null;
+        }
+        const text = String(value).replace(' ', 'T');
+        const wall = Date.parse(text.length <= 10 ? `${text}T00:00:00Z` : `${text.slice(0, 19)}Z`);
+        return Number.isNaN(wall) ? null : wall / 1000 - timeBase;
+    }
+
+    // Positions of the rows with a selected value in every dimension and a
+    // time inside [start, end]; missing values (code -1) never match
+    function selectRows(payload, columns, selections, start, end) {
+        if (start === null || end === null) {
+            return new Int32Array(0);
+        }
+        const tables = Object.entries(selections).map(([dim, values]) => {
+            const wanted = new Set(values || []);
+            return [columns[dim], payload.categories[dim].map(label => wanted.has(label))];
+        });
+        const times = columns.time;
+        const rows = new Int32Array(times.length);
+        let count = 0;
+        for (let i = 0; i < times.length; i++) {
+            if (times[i] !== MISSING_TIME && times[i] >= start && times[i] <= end
+                    && tables.every(([codes, table]) => table[codes[i]] === true)) {
+                rows[count++] = i;
+            }
+        }
+        return rows.subarray(0, count);
+    }
+
+    // Python's str() of a float: whole numbers keep one decimal
+    function pyFloat(value) {
+        if (Number.isNaN(value)) {
+            return 'nan';
+        }
+        return Number.isInteger(value) ? value.toFixed(1) : String(value);
+    }
+
+    function round(value, digits) {
+        const scale = 10 ** digits;
+        return Math.round(value * scale) / scale;
+    }
+
+    function formatPlayTime(totalSeconds) {
+        const day = 24 * 60 * 60;
+        const days = Math.floor(totalSeconds / day);
+        const remaining = totalSeconds % day;
+        return `${days}d ${Math.floor(remaining / 3600)}h ${Math.floor((remaining % 3600) / 60)}m`;
+    }
+
+    // stats.compute_stats, formatted as the cards print it
+    function computeStats(columns, rows) {
+        let kills = 0, deaths = 0, wins = 0, shots = 0, hits = 0, seconds = 0;
+        let scoreSum = 0, scoreCount = 0, skillSum = 0, skillCount = 0, bestStreak = null;
+        for (const i of rows) {
+            kills += columns.kills[i];
+            deaths += columns.deaths[i];
+            wins += columns.win[i];
+            shots += columns.shots[i];
+            hits += columns.hits[i];
+            seconds += columns.seconds[i];
+            if (!Number.isNaN(columns.score[i])) {
+                scoreSum += columns.score[i];
+                scoreCount++;
+            }
+            if (!Number.isNaN(columns.skill[i])) {
+                skillSum += columns.skill[i];
+                skillCount++;
+            }
+            if (!Number.isNaN(columns.streak[i]) && (bestStreak === null || columns.streak[i] > bestStreak)) {
+                bestStreak = columns.streak[i];
+            }
+        }
+        const matches = rows.length;
+        const totalSeconds = Math.floor(seconds);
+        return {
+            matches: String(matches),
+            kd_ratio: pyFloat(round(kills / (deaths || 1), 2)),
+            win_rate: pyFloat(round(wins / (matches || 1) * 100, 1)),
+            accuracy: pyFloat(round(hits / (shots || 1) * 100, 1)),
+            avg_score: String(Math.round(scoreSum / scoreCount)),
+            avg_skill: pyFloat(round(skillSum / skillCount, 2)),
+            best_streak: bestStreak === null ? 'None' : String(bestStreak),
+            total_seconds: String(totalSeconds),
+            total_time: formatPlayTime(totalSeconds),
+        };
+    }
+
+    // Replace '{name}' placeholders in the string props of a component tree
+    function fillTemplate(node, values) {
+        if (typeof node === 'string') {
+            return node.replace(/\{(\w+)\}/g, (match, name) => name in values ? values[name] : match);
+        }
+        if (Array.isArray(node)) {
+            return node.map(child => fillTemplate(child, values));
+        }
+        if (node && typeof node === 'object') {
+            const filled = {};
+            for (const [key, value] of Object.entries(node)) {
+                filled[key] = fillTemplate(value, values);
+            }
+            return filled;
+        }
+        return node;
+    }
+
+    // numpy.histogram with equal-width bins over the finite values
+    function histogram(values) {
+        const finite = values.filter(Number.isFinite);
+        // A loop rather than Math.min(...finite), which overflows the call
+        // stack on large selections
+        let first = Infinity, last = -Infinity;
+        for (const value of finite) {
+            if (value < first) first = value;
+            if (value > last) last = value;
+        }
+        if (!finite.length) {
+            first = 0;
+            last = 1;
+        }
+        if (first === last) {
+            first -= 0.5;
+            last += 0.5;
+        }
+        const step = (last - first) / HISTOGRAM_BINS;
+        const edges = Array.from({length: HISTOGRAM_BINS + 1}, (_, i) => i * step + first);
+        edges[HISTOGRAM_BINS] = last;
+        const counts = new Array(HISTOGRAM_BINS).fill(0);
+        const norm = HISTOGRAM_BINS / (last - first);
+        for (const value of finite) {
+            let bin = Math.floor((value - first) * norm);
+            if (bin === HISTOGRAM_BINS) bin--;
+            if (value < edges[bin]) bin--;
+            else if (bin !== HISTOGRAM_BINS - 1 && value >= edges[bin + 1]) bin++;
+            counts[bin]++;
+        }
+        return {counts, edges};
+    }
+
+    function histogramFigure(template, values) {
+        const {counts, edges} = histogram(values);
+        const figure = JSON.parse(JSON.stringify(template));
+        const trace = figure.data[0];
+        trace.x = counts.map((_, i) => (edges[i] + edges[i + 1]) / 2);
+        trace.y = counts;
+        trace.width = counts.map((_, i) => edges[i + 1] - edges[i]);
+        trace.customdata = counts.map((_, i) => [edges[i], edges[i + 1]]);
+        return figure;
+    }
+
+    function hourLabel(hour) {
+        const twelve = hour > 0 && hour < 12 ? hour : hour === 12 ? 12 : hour - 12;
+        return `${twelve} ${hour < 12 ? 'AM' : 'PM'}`;
+    }
+
+    function withXY(template, x, y) {
+        const figure = JSON.parse(JSON.stringify(template));
+        figure.data[0].x = x;
+        figure.data[0].y = y;
+        return figure;
+    }
+
+    // MatchAggregates.by_hour: mean K/D per hour with any K/D value
+    function kdByHourFigure(template, columns, rows) {
+        const sums = new Float64Array(24), counts = new Float64Array(24);
+        for (const i of rows) {
+            if (!Number.isNaN(columns.kd[i])) {
+                sums[columns.hour[i]] += columns.kd[i];
+                counts[columns.hour[i]]++;
+            }
+        }
+        const hours = [...Array(24).keys()].filter(hour => counts[hour] > 0);
+        return withXY(template, hours.map(hourLabel), hours.map(hour => sums[hour] / counts[hour]));
+    }
+
+    // MatchAggregates.by_map, as K/D per map in ascending order
+    function mapPerformanceFigure(template, payload, columns, rows) {
+        const maps = payload.categories.Map;
+        const kills = new Float64Array(maps.length), deaths = new Float64Array(maps.length);
+        const present = new Uint8Array(maps.length);
+        for (const i of rows) {
+            const code = columns.Map[i];
+            if (code >= 0) {
+                kills[code] += columns.kills[i];
+                deaths[code] += columns.deaths[i];
+                present[code] = 1;
+            }
+        }
+        const bars = maps.map((name, code) => ({name, kd: round(kills[code] / (deaths[code] || 1), 2)}))
+            .filter((_, code) => present[code])
+            .sort((a, b) => a.kd - b.kd);
+        return withXY(template, bars.map(bar => bar.name), bars.map(bar => bar.kd));
+    }
+
+    // figures.outcome_figure: matches per outcome, most frequent first, ties
+    // in category order
+    function outcomeFigure(template, payload, columns, rows) {
+        const outcomes = payload.categories['Match Outcome'];
+        const counts = new Array(outcomes.length).fill(0);
+        for (const i of rows) {
+            if (columns.outcome[i] >= 0) {
+                counts[columns.outcome[i]]++;
+            }
+        }
+        const slices = outcomes.map((name, code) => ({name, count: counts[code]}))
+            .filter(slice => slice.count > 0)
+            .sort((a, b) => b.count - a.count);
+        const figure = JSON.parse(JSON.stringify(template));
+        figure.data[0].labels = slices.map(slice => slice.name);
+        figure.data[0].values = slices.map(slice => slice.count);
+        return figure;
+    }
+
+    // MatchAggregates.day_hour: match counts, Monday first, hours that occur;
+    // like its group-by, rows without a day or map are left out
+    function activityHeatmapFigure(template, payload, columns, rows) {
+        const counts = payload.days.map(() => new Array(24).fill(0));
+        const dayPresent = payload.days.map(() => false);
+        const hourPresent = new Array(24).fill(false);
+        for (const i of rows) {
+            const day = columns.day[i];
+            if (day >= 0 && columns.Map[i] >= 0) {
+                counts[day][columns.hour[i]]++;
+                dayPresent[day] = true;
+                hourPresent[columns.hour[i]] = true;
+            }
+        }
+        const hours = [...Array(24).keys()].filter(hour => hourPresent[hour]);
+        const figure = JSON.parse(JSON.stringify(template));
+        const trace = figure.data[0];
+        trace.z = counts.map((row, day) => dayPresent[day] ? hours.map(hour => row[hour]) : hours.map(() => null));
+        trace.x = hours.map(hourLabel);
+        trace.y = payload.days;
+        return figure;
+    }
+
+    function columnValues(column, rows, keep) {
+        const values = [];
+        for (const i of rows) {
+            if (!keep || keep(i)) {
+                values.push(column[i]);
+            }
+        }
+        return values;
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        matchFilter: {
+            // Returns the stats cards followed by one figure per CLIENT_FIGURES entry
+            update: function (operators, gameTypes, maps, startDate, endDate, payload) {
+                const noUpdate = window.dash_clientside.no_update;
+                if (!payload) {
+                    return [noUpdate, ...Array(7).fill(noUpdate)];
+                }
+                const columns = decode(payload);
+                const rows = selectRows(payload, columns,
+                    {'Operator': operators, 'Game Type': gameTypes, 'Map': maps},
+                    wallSeconds(startDate, payload.time_base), wallSeconds(endDate, payload.time_base));
+
+                const stats = computeStats(columns, rows);
+                const cards = fillTemplate(rows.length ? payload.cards.full : payload.cards.empty, stats);
+
+                const figures = payload.figures;
+                const validAccuracy = i => columns.accuracy[i] >= 0 && columns.accuracy[i] <= 1 && columns.shots[i] > 0;
+                return [
+                    cards,
+                    kdByHourFigure(figures['kd-by-hour-plot'], columns, rows),
+                    histogramFigure(figures['accuracy-hist'], columnValues(columns.accuracy, rows, validAccuracy)),
+                    histogramFigure(figures['kd-hist'], columnValues(columns.kd, rows)),
+                    histogramFigure(figures['skill-hist'], columnValues(columns.skill, rows)),
+                    mapPerformanceFigure(figures['map-performance'], payload, columns, rows),
+                    outcomeFigure(figures['outcome-plot'], payload, columns, rows),
+                    activityHeatmapFigure(figures['activity-heatmap'], payload, columns, rows),
+                ];
+            }
+        }
+    });
+})();
@@ -0,0 +1,151 @@
+"""Analyse a directory of data-export HTML files without the dashboard.
+
+    python batch.py exports/ --output results/ --workers 4
+
+Exports are parsed in parallel worker processes with the same processing as
+an upload in the app (game type exclusions, local time). For every export
+the worker writes its matches to results/matches/Player=<file name>/, so
+the combined dataset can be read back with pd.read_parquet('results/matches').
+results/stats.csv holds the stats card numbers per player, with the time
+taken and the error of any export that failed. One failing export does not
+stop the others, nor does a worker process that dies: the exports it took
+down with the pool are retried one per process.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from dataset_cache import HAVE_ARROW
+from html_parser import parse_html_file
+from processing import process_data
+from projection import DASHBOARD_COLUMNS
+from stats import compute_stats
+
+
+def player_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def analyse_export(path, output_dir, columns=DASHBOARD_COLUMNS):
+    """Parse and process one export, write its matches and return its stats row.
+
+    Runs in a worker process; errors are returned in the row rather than
+    raised so one bad export does not affect the rest.
+    """
+    player = player_name(path)
+    row = {'player': player, 'file': path}
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            data = process_data(parse_html_file(f, streaming=True, columns=columns))
+        row.update(compute_stats(data))
+
+        directory = os.path.join(output_dir, 'matches', f'Player={player}')
+        os.makedirs(directory, exist_ok=True)
+        target = os.path.join(directory, 'matches.parquet')
+        data.to_parquet(target + '.tmp', index=False)
+        os.replace(target + '.tmp', target)
+        row['error'] = None
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+        row['traceback'] = traceback.format_exc()
+    row['seconds'] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def failed_row(path, error):
+    return {'player': player_name(path), 'file': path,
+            'error': f"{type(error).__name__}: {error}", 'seconds': None}
+
+
+def analyse_isolated(path, output_dir, columns=DASHBOARD_COLUMNS):
+    """Run analyse_export in a process of its own.
+
+    If the process dies (a crash in an extension, killed for memory) only
+    this export is recorded as failed.
+    """
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(analyse_export, path, output_dir, columns).result()
+        except Exception as e:
+            return failed_row(path, e)
+
+
+def run_batch(paths, output_dir, workers=None, columns=DASHBOARD_COLUMNS, log=sys.stderr):
+    """Analyse every export in paths with a process pool; returns the stats frame."""
+    rows = []
+
+    def report(row):
+        rows.append(row)
+        if row['error']:
+            status = f"FAILED {row['error']}"
+        else:
+            status = f"{row['matches']} matches in {row['seconds']:.2f}s"
+        print(f"[{len(rows)}/{len(paths)}] {row['player']}: {status}", file=log, flush=True)
+        if row.get('traceback'):
+            print(row['traceback'], file=log)
+
+    # A worker that dies breaks the whole pool, failing every export still
+    # queued or running in it; those are kept for a second pass
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyse_export, path, output_dir, columns): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                report(future.result())
+            except BrokenProcessPool:
+                unfinished.append(path)
+            except Exception as e:
+                report(failed_row(path, e))
+
+    if unfinished:
+        print(f"A worker process died; retrying {len(unfinished)} exports one per process",
+              file=log, flush=True)
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as threads:
+            futures = [threads.submit(analyse_isolated, path, output_dir, columns)
+                       for path in sorted(unfinished)]
+            for future in as_completed(futures):
+                report(future.result())
+
+    stats = pd.DataFrame(rows).drop(columns=['traceback'], errors='ignore')
+    columns = ['player', 'file'] + [col for col in stats.columns if col not in ('player', 'file', 'seconds', 'error')]
+    stats = stats[columns + ['seconds', 'error']].convert_dtypes()
+    return stats.sort_values('player', kind='stable').reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', help='directory of data-export HTML files')
+    parser.add_argument('--output', default='batch_output', help='output directory')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per core)')
+    parser.add_argument('--pattern', default='*.html', help='file name pattern of the exports')
+    parser.add_argument('--full-fidelity', action='store_true', help='keep every export column')
+    args = parser.parse_args()
+
+    if not HAVE_ARROW:
+        parser.error("writing Parquet output needs pyarrow")
+    paths = sorted(glob.glob(os.path.join(args.input, args.pattern)))
+    if not paths:
+        parser.error(f"no files matching {args.pattern} in {args.input}")
+
+    os.makedirs(args.output, exist_ok=True)
+    start = time.perf_counter()
+    stats = run_batch(paths, args.output, args.workers, None if args.full_fidelity else DASHBOARD_COLUMNS)
+    stats.to_csv(os.path.join(args.output, 'stats.csv'), index=False)
+
+    failed = stats['error'].notna().sum()
+    print(f"{len(stats) - failed} of {len(stats)} exports analysed in "
+          f"{time.perf_counter() - start:.1f}s; results in {args.output}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Compare untyped and typed CSV loading on a synthetic match CSV.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_csv --rows 1000000
+
+"untyped" is the old example data path: pd.read_csv with inference and
+format-guessing pd.to_datetime on the timestamp columns. The typed modes use
+csv_loader.read_csv with each engine, and "pruned" also limits the columns
+to the ones the dashboard uses. Each mode runs in its own subprocess so peak
+RSS is measured independently.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_csv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMESTAMP_COLUMNS = ['UTC Timestamp', 'Match Start Timestamp', 'Match End Timestamp']
+
+# Columns read by the "pruned" mode
+PRUNED_COLUMNS = ['UTC Timestamp', 'Match Start Timestamp', 'Match End Timestamp',
+                  'Game Type', 'Map', 'Operator', 'Match Outcome', 'Match ID',
+                  'Skill', 'Score', 'Shots', 'Hits', 'Kills', 'Deaths', 'Headshots',
+                  'Damage Done', 'Damage Taken', 'Longest Streak']
+
+
+def run_mode(path, mode):
+    """Load path with the given mode and print timing and peak RSS as JSON."""
+    sys.path.insert(0, REPO_ROOT)
+    import pandas as pd
+    from csv_loader import read_csv
+
+    start = time.perf_counter()
+    if mode == 'untyped':
+        df = pd.read_csv(path)
+        for col in TIMESTAMP_COLUMNS:
+            df[col] = pd.to_datetime(df[col])
+    elif mode == 'pruned':
+        df = read_csv(path, columns=PRUNED_COLUMNS)
+    else:
+        df = read_csv(path, engine=mode.split('-')[1])
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak *= 1024
+    print(json.dumps({'mode': mode, 'rows': len(df), 'seconds': elapsed,
+                      'peak_rss_mb': peak / 2**20,
+                      'frame_mb': df.memory_usage(deep=True).sum() / 2**20}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--file', help='existing CSV to benchmark instead of a synthetic one')
+    parser.add_argument('--mode', choices=['untyped', 'typed-c', 'typed-pyarrow', 'pruned'],
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.file, args.mode)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = os.path.join(tmp, 'matches.csv')
+            write_csv(path, args.rows)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"CSV: {path} ({size_mb:.1f} MB)")
+        for mode in ('untyped', 'typed-c', 'typed-pyarrow', 'pruned'):
+            result = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_csv', '--mode', mode, '--file', path],
+                cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+            stats = json.loads(result.stdout)
+            print(f"{mode:>13}: {stats['rows']} rows in {stats['seconds']:.2f}s, "
+                  f"frame {stats['frame_mb']:.0f} MB, peak RSS {stats['peak_rss_mb']:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Time one dashboard interaction with and without the shared filter result.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_interaction --matches 50000
+
+An interaction fires create_plots and create_stats on the same filter
+inputs. "separate" clears the filter cache between the two callbacks, which
+is how every interaction behaved before the result was shared. Every other
+memo of filter results, figures, cube selections and trend statistics is
+cleared before each interaction in both modes, so nothing is a cache hit
+left over from an earlier one; the per-dataset index and cube are kept, as
+they are between real interactions.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def filter_states(frame, count, seed=0):
+    """Return count distinct (operators, game types, maps, date range) states."""
+    rng = random.Random(seed)
+    options = {col: sorted(frame[col].unique()) for col in ('Operator', 'Game Type', 'Map')}
+    start = frame['Local Time'].min().replace(tzinfo=None)
+    end = frame['Local Time'].max().replace(tzinfo=None)
+    states = []
+    for _ in range(count):
+        picks = [rng.sample(values, rng.randint(1, len(values))) for values in options.values()]
+        states.append((*picks, start, end))
+    return states
+
+
+def clear_caches(analysis):
+    """Forget every memoised filter result, figure and statistic."""
+    import aggregates
+    analysis.filter_dataset.cache_clear()
+    analysis.cube_selection.cache_clear()
+    analysis.figure_cache.clear()
+    with aggregates._trend_stats_lock:
+        aggregates._trend_stats_cache.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--matches', type=int, default=50000)
+    parser.add_argument('--interactions', type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault('DATASET_CACHE_DIR', tmp)
+    sys.path.insert(0, REPO_ROOT)
+    import analysis
+    from benchmarks.synthetic import write_export
+    from html_parser import parse_html_stream
+
+    path = os.path.join(tmp, 'export.html')
+    write_export(path, args.matches)
+    with open(path, 'rb') as f:
+        dataset_id, frame, _ = analysis.load_dataset(f.read(), parse_html_stream)
+    states = filter_states(frame, args.interactions)
+
+    # Warm up imports and plotly templates outside the timed loop
+    analysis.create_plots(*states[0], dataset_id)
+
+    for mode in ('separate', 'shared'):
+        filter_time = total_time = 0.0
+        for operators, game_types, maps, start, end in states:
+            clear_caches(analysis)
+            began = time.perf_counter()
+            for callback in (analysis.create_plots, analysis.create_stats):
+                if mode == 'separate':
+                    analysis.filter_dataset.cache_clear()
+                step = time.perf_counter()
+                analysis.get_filtered_data(dataset_id, operators, game_types, maps, (start, end))
+                filter_time += time.perf_counter() - step
+                callback(operators, game_types, maps, start, end, dataset_id)
+            total_time += time.perf_counter() - began
+        n = len(states)
+        print(f"{mode:>8}: filtering {1000 * filter_time / n:.1f} ms, "
+              f"interaction {1000 * total_time / n:.1f} ms (mean of {n})")
+
+
+if __name__ == '__main__':
+    main()
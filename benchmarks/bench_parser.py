@@ -0,0 +1,73 @@
+"""Compare the BeautifulSoup and streaming parsers on a synthetic export.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parser --matches 20000
+
+Each mode runs in its own subprocess so peak RSS is measured independently.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_export
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_mode(path, mode):
+    """Parse path with the given mode and print timing and peak RSS as JSON."""
+    sys.path.insert(0, REPO_ROOT)
+    from html_parser import parse_html_file, parse_html_stream
+
+    start = time.perf_counter()
+    if mode == 'soup':
+        with open(path, encoding='utf-8') as f:
+            df = parse_html_file(f.read())
+    else:
+        with open(path, 'rb') as f:
+            df = parse_html_stream(f)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak *= 1024
+    print(json.dumps({'mode': mode, 'rows': len(df), 'seconds': elapsed,
+                      'peak_rss_mb': peak / 2**20}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--matches', type=int, default=20000)
+    parser.add_argument('--file', help='existing export to benchmark instead of a synthetic one')
+    parser.add_argument('--mode', choices=['soup', 'stream'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.file, args.mode)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = os.path.join(tmp, 'export.html')
+            write_export(path, args.matches)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"Export: {path} ({size_mb:.1f} MB)")
+        for mode in ('soup', 'stream'):
+            result = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_parser', '--mode', mode, '--file', path],
+                cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+            stats = json.loads(result.stdout)
+            print(f"{mode:>6}: {stats['rows']} rows in {stats['seconds']:.2f}s, "
+                  f"peak RSS {stats['peak_rss_mb']:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
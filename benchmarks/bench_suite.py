@@ -0,0 +1,211 @@
+"""Time the load and interaction paths on synthetic exports of several sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_suite                          # 1k, 10k, 100k and 1M matches
+    python -m benchmarks.bench_suite --sizes 1000 10000 --output results.json
+    python -m benchmarks.bench_suite --compare baseline.json  # exit 1 on regressions
+
+Stages, each timed cold (caches cleared first):
+
+    parse_html_file     BeautifulSoup parser, up to --soup-max matches
+    parse_html_stream   streaming parser with the dashboard's column projection
+    process_data        load-time processing of the parsed rows
+    load_dataset        update_data's upload path: parse, process, cache
+    load_dataset_cached the same upload again, served from the dataset cache
+    get_filtered_data   every operator, game type and map over the full range
+    create_stats        the stats cards callback
+    create_plots        the charts callback
+
+Each size runs in its own subprocess. Every stage is timed once without
+tracing, then run again under tracemalloc for its peak Python allocation
+(--no-memory skips that second run). Results go to --output as JSON, one
+entry per size, with the peak RSS of the subprocess.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import write_export
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZES = [1000, 10000, 100000, 1000000]
+
+
+def export_path(data_dir, n_matches):
+    """Return a synthetic export with n_matches rows, written on first use."""
+    path = os.path.join(data_dir, f'export-{n_matches}.html')
+    if not os.path.exists(path):
+        write_export(path + '.tmp', n_matches)
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def measure(run, reset, memory):
+    """Time run() after reset(); with memory, also its tracemalloc peak."""
+    reset()
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    result = {'seconds': time.perf_counter() - start, 'peak_mb': None}
+    if memory:
+        reset()
+        gc.collect()
+        tracemalloc.start()
+        run()
+        result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result
+
+
+def run_size(path, n_matches, soup_max, memory):
+    """Run every stage on the export at path and print the results as JSON."""
+    sys.path.insert(0, REPO_ROOT)
+    import analysis
+    from html_parser import parse_html_file, parse_html_stream
+    from processing import process_data
+
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    def nothing():
+        pass
+
+    def reset_all():
+        import aggregates
+        analysis.dataset_cache.clear()
+        analysis.dataset_store.put(dataset_id, frame)  # drops derived indexes
+        analysis.filter_dataset.cache_clear()
+        analysis.cube_selection.cache_clear()
+        analysis.figure_cache.clear()
+        with aggregates._trend_stats_lock:
+            aggregates._trend_stats_cache.clear()
+
+    stages = {}
+    if n_matches <= soup_max:
+        stages['parse_html_file'] = measure(lambda: parse_html_file(content.decode('utf-8')),
+                                            nothing, memory)
+    parsed = parse_html_stream(content, columns=analysis.DATASET_COLUMNS)
+    stages['parse_html_stream'] = measure(
+        lambda: parse_html_stream(content, columns=analysis.DATASET_COLUMNS), nothing, memory)
+    stages['process_data'] = measure(lambda: process_data(parsed.copy()), nothing, memory)
+
+    dataset_id, frame, _ = analysis.load_dataset(content, parse_html_stream)
+    stages['load_dataset'] = measure(
+        lambda: analysis.load_dataset(content, parse_html_stream), reset_all, memory)
+    stages['load_dataset_cached'] = measure(
+        lambda: analysis.load_dataset(content, parse_html_stream),
+        lambda: (reset_all(), analysis.dataset_cache.put(dataset_id, frame)), memory)
+
+    selection = [sorted(frame[col].unique()) for col in ('Operator', 'Game Type', 'Map')]
+    start = frame['Local Time'].min().replace(tzinfo=None)
+    end = frame['Local Time'].max().replace(tzinfo=None)
+    stages['get_filtered_data'] = measure(
+        lambda: analysis.get_filtered_data(dataset_id, *selection, (start, end)), reset_all, memory)
+    for callback in (analysis.create_stats, analysis.create_plots):
+        stages[callback.__name__] = measure(
+            lambda: callback(*selection, start, end, dataset_id), reset_all, memory)
+
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak *= 1024
+    print(json.dumps({'matches': n_matches, 'rows': len(frame),
+                      'export_mb': len(content) / 2**20, 'peak_rss_mb': peak / 2**20,
+                      'stages': stages}))
+
+
+def git_commit():
+    result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                            capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def regressions(results, baseline, tolerance):
+    """Return (matches, stage, old seconds, new seconds) slower than baseline by more than tolerance."""
+    old = {(entry['matches'], stage): value['seconds']
+           for entry in baseline['results'] for stage, value in entry['stages'].items()}
+    slower = []
+    for entry in results:
+        for stage, value in entry['stages'].items():
+            before = old.get((entry['matches'], stage))
+            if before is not None and value['seconds'] > before * (1 + tolerance):
+                slower.append((entry['matches'], stage, before, value['seconds']))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, metavar='MATCHES')
+    parser.add_argument('--soup-max', type=int, default=100000,
+                        help='largest export timed with the BeautifulSoup parser')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc runs')
+    parser.add_argument('--data-dir', help='keep the generated exports here for later runs')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help='results of an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown against the baseline, as a fraction')
+    parser.add_argument('--run-size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_size:
+        run_size(args.file, args.run_size, args.soup_max, not args.no_memory)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+        results = []
+        for n_matches in args.sizes:
+            path = export_path(data_dir, n_matches)
+            command = [sys.executable, '-m', 'benchmarks.bench_suite', '--run-size', str(n_matches),
+                       '--file', path, '--soup-max', str(args.soup_max)]
+            if args.no_memory:
+                command.append('--no-memory')
+            # A fresh cache directory per size, so no earlier run can serve it
+            env = dict(os.environ, DATASET_CACHE_DIR=tempfile.mkdtemp(dir=tmp))
+            result = subprocess.run(command, cwd=REPO_ROOT, env=env,
+                                    capture_output=True, text=True, check=True)
+            entry = json.loads(result.stdout.splitlines()[-1])
+            results.append(entry)
+            print(f"{n_matches} matches ({entry['export_mb']:.1f} MB export, "
+                  f"peak RSS {entry['peak_rss_mb']:.0f} MB)")
+            for stage, value in entry['stages'].items():
+                peak = f", peak {value['peak_mb']:.1f} MB" if value['peak_mb'] is not None else ''
+                print(f"  {stage:>19}: {value['seconds']:.3f}s{peak}")
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        slower = regressions(results, baseline, args.tolerance)
+        for n_matches, stage, before, after in slower:
+            print(f"REGRESSION {n_matches} matches {stage}: {before:.3f}s -> {after:.3f}s")
+        if slower:
+            sys.exit(1)
+        print(f"No stage slower than {args.compare} by more than {args.tolerance:.0%}")
+
+
+if __name__ == '__main__':
+    main()
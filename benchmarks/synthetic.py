@@ -0,0 +1,131 @@
+"""Synthetic Black Ops 6 data exports for the benchmarks.
+
+Rows have the example CSV's columns. Matches are generated newest first in
+play sessions of a few matches separated by gaps of hours to days, so
+timestamps, dates and hours vary like a real export; maps, game types,
+operators, outcomes and per-match stats are drawn at random from a seeded
+generator, so the same size and seed always give the same file.
+"""
+import csv
+import datetime
+import os
+import random
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLE_CSV = os.path.join(REPO_ROOT, 'data2.csv')
+
+MAPS = ['Babylon', 'Derelict', 'Hacienda', 'Lowtown', 'Nuketown', 'Payback', 'Pit',
+        'Protocol', 'Red Card', 'Rewind', 'Skyline', 'Stakeout', 'Subsonic', 'Vault',
+        'Vorkuta', 'Warhead']
+
+# Weighted towards the common modes; a few excluded game types are mixed in
+# so process_data has rows to drop
+GAME_TYPES = ['Team Deathmatch'] * 6 + ['Domination'] * 4 + ['Kill Order'] * 2 + [
+    'Hardpoint', 'Kill Confirmed', 'Search and Destroy', 'Control', 'Gunfight',
+    'Prop Hunt', 'Training Course']
+
+OPERATORS = ['ADLER', 'BECK', 'BRODY', 'CARVER', 'GREY', 'GUZMAN', 'HUNTER', 'MARSHALL',
+             'NAVARRO', 'RAZOR', 'SEVATI', 'STITCH', 'WOODS']
+
+OUTCOMES = ['win', 'win', 'loss', 'loss', 'draw', 'left']
+
+# Newest match in every generated export
+LATEST_MATCH = datetime.datetime(2025, 1, 9, 4, 19, 58)
+
+
+def export_timestamp(moment):
+    """Format a datetime like the export does, without a leading zero on the hour."""
+    return f"{moment:%Y-%m-%d} {moment.hour}:{moment:%M:%S}"
+
+
+def export_columns():
+    """Return the export headers and the example rows used for other columns."""
+    with open(EXAMPLE_CSV, newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader)
+        return headers, list(reader)
+
+
+def match_rows(n_matches, seed=0):
+    """Yield n_matches synthetic rows, newest first, in export column order."""
+    headers, templates = export_columns()
+    column = {name: i for i, name in enumerate(headers)}
+    rng = random.Random(seed)
+
+    end = LATEST_MATCH
+    session_left = rng.randint(1, 12)
+    for i in range(n_matches):
+        row = list(templates[i % len(templates)])
+        duration = rng.randint(120, 900)
+        start = end - datetime.timedelta(seconds=duration)
+
+        shots = rng.randint(0, 1500)
+        hits = int(shots * rng.uniform(0.1, 0.35))
+        kills = rng.randint(0, 40)
+        values = {
+            'UTC Timestamp': export_timestamp(start),
+            'Match Start Timestamp': export_timestamp(start),
+            'Match End Timestamp': export_timestamp(end),
+            'Match ID': str(rng.getrandbits(63)),
+            'Game Type': rng.choice(GAME_TYPES),
+            'Map': rng.choice(MAPS),
+            'Operator': rng.choice(OPERATORS),
+            'Match Outcome': rng.choice(OUTCOMES),
+            'Team': rng.choice(['allies', 'axis']),
+            'Skill': str(rng.randint(-200, 600)),
+            'Score': str(rng.randint(0, 8000)),
+            'Shots': str(shots),
+            'Hits': str(hits),
+            'Kills': str(kills),
+            'Deaths': str(rng.randint(0, 30)),
+            'Headshots': str(rng.randint(0, kills)),
+            'Assists': str(rng.randint(0, 15)),
+            'Longest Streak': str(rng.randint(0, min(kills, 20))),
+            'Damage Done': str(kills * rng.randint(90, 160)),
+            'Damage Taken': str(rng.randint(0, 4000)),
+        }
+        for name, value in values.items():
+            row[column[name]] = value
+        yield row
+
+        # A short lobby wait inside a session, hours or days between sessions
+        session_left -= 1
+        if session_left:
+            gap = rng.randint(30, 180)
+        else:
+            gap = rng.randint(3600, 3 * 86400)
+            session_left = rng.randint(1, 12)
+        end = start - datetime.timedelta(seconds=gap)
+
+
+def write_export(path, n_matches, filler_rows=2000, seed=0):
+    """Write a synthetic data-export HTML file with n_matches rows.
+
+    The layout is what the parsers look for: "Copy of Your Data", then the
+    Black Ops 6 title h1, the "Multiplayer Match Data" h2 and its table.
+    """
+    headers, _ = export_columns()
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write('<html><body>\n<h1>Copy of Your Data</h1>\n')
+        # Other titles come first in real exports and must be skipped
+        out.write('<h1> Call of Duty: Modern Warfare III</h1>\n<table>\n')
+        for i in range(filler_rows):
+            out.write(f'<tr><td>{i}</td><td>filler</td><td>row</td></tr>\n')
+        out.write('</table>\n')
+        out.write('<h1> Call of Duty: Black Ops 6</h1>\n')
+        out.write('<h2>Multiplayer Match Data (reverse chronological)</h2>\n<table>\n<tr>')
+        out.write(''.join(f'<th>{h}</th>' for h in headers))
+        out.write('</tr>\n')
+        for row in match_rows(n_matches, seed):
+            out.write('<tr>' + ''.join(f'<td>{v}</td>' for v in row) + '</tr>\n')
+        out.write('</table>\n<h2>Other Match Data</h2>\n<table><tr><td>x</td></tr></table>\n')
+        out.write('</body></html>\n')
+
+
+def write_csv(path, n_matches, seed=0):
+    """Write a synthetic match CSV with n_matches rows, newest first."""
+    headers, _ = export_columns()
+    with open(path, 'w', newline='') as out:
+        writer = csv.writer(out)
+        writer.writerow(headers)
+        writer.writerows(match_rows(n_matches, seed))
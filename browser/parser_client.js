@@ -0,0 +1,45 @@
+// Main-thread side of parser_worker.js: one promise per parsed export.
+export class ParserWorker {
+    constructor(url = new URL('parser_worker.js', import.meta.url)) {
+        this.worker = new Worker(url);
+        this.pending = new Map();
+        this.nextId = 0;
+        this.ready = new Promise(resolve => { this.onReady = resolve; });
+        this.worker.onmessage = event => this.handle(event.data);
+    }
+
+    // Parse an export (ArrayBuffer, transferred to the worker) into a
+    // processed frame; resolves to {format, buffer, rows, seconds}.
+    // onProgress receives {rows, bytes, total} after each parsed chunk;
+    // formats are the frame formats the caller can decode (frame_formats()).
+    parse(buffer, {columns = null, formats = ['pickle'], onProgress = null} = {}) {
+        const id = this.nextId++;
+        return new Promise((resolve, reject) => {
+            this.pending.set(id, {resolve, reject, onProgress});
+            this.worker.postMessage({id, buffer, columns, formats}, [buffer]);
+        });
+    }
+
+    handle(message) {
+        if (message.type === 'ready') {
+            this.onReady();
+            return;
+        }
+        const request = this.pending.get(message.id);
+        if (!request) {
+            return;
+        }
+        if (message.type === 'progress') {
+            if (request.onProgress) {
+                request.onProgress(message);
+            }
+            return;
+        }
+        this.pending.delete(message.id);
+        if (message.type === 'result') {
+            request.resolve(message);
+        } else {
+            request.reject(new Error(message.message));
+        }
+    }
+}
@@ -0,0 +1,85 @@
+// Parses data exports off the main thread with a Pyodide instance of its own.
+//
+// In:  {id, buffer: ArrayBuffer of the export, columns: [names] or null,
+//       formats: frame formats the main thread can decode, preferred first}
+// Out: {id, type: 'ready'}
+//      {id, type: 'progress', rows, bytes, total}
+//      {id, type: 'result', format: 'arrow' or 'pickle', buffer, rows, seconds}
+//      {id, type: 'error', message}
+//
+// Buffers are transferred in both directions, so neither the export nor the
+// processed frame is copied between threads.
+importScripts('https://cdn.jsdelivr.net/pyodide/v0.24.1/full/pyodide.js');
+
+const PARSE_EXPORT = `
+import sys
+import time
+sys.path.insert(0, '/home/pyodide/app')
+
+from frame_ipc import encode_frame
+from html_parser import parse_html_stream
+from processing import process_data
+
+
+def parse_export(path, columns, formats, progress):
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        frame = process_data(parse_html_stream(f, columns=columns, progress=progress))
+    format, data = encode_frame(frame, formats)
+    return format, data, len(frame), time.perf_counter() - start
+`;
+
+const ready = (async () => {
+    const pyodide = await loadPyodide({
+        indexURL: "https://cdn.jsdelivr.net/pyodide/v0.24.1/full/"
+    });
+    const manifest = await (await fetch('manifest.json')).json();
+    const sources = Promise.all(manifest.worker_modules.map(
+        name => fetch(`../${name}`).then(response => response.text())));
+    await pyodide.loadPackage(manifest.worker_packages);
+    try {
+        // Frames go back as Arrow IPC when both sides have pyarrow (not every
+        // Pyodide distribution does), as pickles otherwise
+        await pyodide.loadPackage(manifest.optional_pyodide_packages);
+    } catch (error) {
+        console.log("Optional packages unavailable, parser worker falls back to pickle");
+    }
+
+    pyodide.FS.mkdirTree('/home/pyodide/app');
+    (await sources).forEach((source, i) => {
+        pyodide.FS.writeFile(`/home/pyodide/app/${manifest.worker_modules[i]}`, source);
+    });
+    pyodide.runPython(PARSE_EXPORT);
+    self.postMessage({id: null, type: 'ready'});
+    return pyodide;
+})();
+
+self.onmessage = async (event) => {
+    const {id, buffer, columns, formats} = event.data;
+    try {
+        const pyodide = await ready;
+        const total = buffer.byteLength;
+        const path = `/tmp/export-${id}.html`;
+        pyodide.FS.writeFile(path, new Uint8Array(buffer));
+
+        const progress = (rows, bytes) => self.postMessage({id, type: 'progress', rows, bytes, total});
+        const parseExport = pyodide.globals.get('parse_export');
+        const result = parseExport(path, columns ? pyodide.toPy(columns) : null,
+                                   pyodide.toPy(formats || ['pickle']), progress);
+        pyodide.FS.unlink(path);
+
+        const format = result.get(0);
+        const data = result.get(1);
+        const view = data.getBuffer('u8');
+        const frame = view.data.slice();  // out of the wasm heap so it can be transferred
+        const message = {id, type: 'result', format, buffer: frame.buffer,
+                         rows: result.get(2), seconds: result.get(3)};
+        view.release();
+        data.destroy();
+        result.destroy();
+        parseExport.destroy();
+        self.postMessage(message, [frame.buffer]);
+    } catch (error) {
+        self.postMessage({id, type: 'error', message: error.message});
+    }
+};
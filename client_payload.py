@@ -0,0 +1,108 @@
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+from plotly.utils import PlotlyJSONEncoder
+
+from aggregates import MatchAggregates
+from figures import FIGURES
+from filter_index import FILTER_DIMENSIONS
+
+# Figures assets/clientside_filter.js recomputes in the browser; the
+# time-series charts need the server's downsampling and are left out
+CLIENT_FIGURES = ['kd-by-hour-plot', 'accuracy-hist', 'kd-hist', 'skill-hist',
+                  'map-performance', 'outcome-plot', 'activity-heatmap']
+
+# Figures clientside mode still draws on the server per filter change: the
+# damage scatter plots every match and fits its trend lines on the server,
+# so it would need every match's damage shipped and the fit redone in the
+# browser
+SERVER_FIGURES = ['damage-plot']
+
+# Per-match columns shipped to the browser, by name in the payload
+INTEGER_COLUMNS = {'kills': 'Kills', 'deaths': 'Deaths', 'shots': 'Shots', 'hits': 'Hits',
+                   'score': 'Score', 'streak': 'Longest Streak', 'seconds': 'Match Duration'}
+FLOAT_COLUMNS = {'skill': 'Skill', 'accuracy': 'Accuracy', 'kd': 'KD_Ratio'}
+
+INT16 = np.iinfo(np.int16)
+
+# 'time' value of matches without a timestamp
+MISSING_TIME = np.iinfo(np.uint32).max
+
+
+def encode_array(values, dtype):
+    """Encode values as base64 little-endian bytes of dtype."""
+    array = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder('<'))
+    return {'dtype': np.dtype(dtype).name, 'data': base64.b64encode(array.tobytes()).decode('ascii')}
+
+
+def encode_column(column):
+    """Encode a numeric column as int16 when it fits, else int32 or float32."""
+    if pd.api.types.is_integer_dtype(column.dtype):
+        values = column.to_numpy()
+        fits = not len(values) or (INT16.min <= values.min() and values.max() <= INT16.max)
+        return encode_array(values, np.int16 if fits else np.int32)
+    return encode_array(column.to_numpy(dtype=np.float32, na_value=np.nan), np.float32)
+
+
+def encode_codes(column):
+    """Return (labels, encoded int8/int16 codes) of a column as a categorical."""
+    column = column.astype('category')
+    codes_dtype = np.int8 if len(column.cat.categories) <= np.iinfo(np.int8).max else np.int16
+    return [str(value) for value in column.cat.categories], encode_array(column.cat.codes.to_numpy(), codes_dtype)
+
+
+def to_json_data(component):
+    """Return a figure or Dash component as the plain JSON data Dash sends."""
+    return json.loads(json.dumps(component, cls=PlotlyJSONEncoder))
+
+
+def encode_dataset(data, figure_templates=None, card_templates=None):
+    """Return the payload clientside mode keeps in the browser's dcc.Store.
+
+    Categories are int8/int16 dictionary codes (-1 for missing) with their labels,
+    'Local Time' is wall-clock seconds after time_base, as the date picker
+    shows it, and the metrics are int16/int32/float32 arrays; every array is
+    base64 encoded.
+    """
+    categories = {}
+    columns = {}
+    for dim in FILTER_DIMENSIONS:
+        categories[dim], columns[dim] = encode_codes(data[dim])
+    categories['Match Outcome'], columns['outcome'] = encode_codes(data['Match Outcome'])
+
+    wall_times = data['Local Time'].dt.tz_localize(None).to_numpy(dtype='datetime64[s]')
+    missing = np.isnat(wall_times)
+    seconds = wall_times.view('i8')
+    time_base = int(seconds[~missing].min()) if (~missing).any() else 0
+    columns['time'] = encode_array(np.where(missing, MISSING_TIME, seconds - time_base), np.uint32)
+    columns['hour'] = encode_array(data['Hour'].to_numpy(), np.uint8)
+    columns['day'] = encode_array(data['Day'].cat.codes.to_numpy(), np.int8)
+    wins = data['Match Outcome'].str.lower().str.contains('win')
+    columns['win'] = encode_array(wins.to_numpy(dtype=np.uint8, na_value=0), np.uint8)
+    for name, column in INTEGER_COLUMNS.items():
+        columns[name] = encode_column(data[column])
+    for name, column in FLOAT_COLUMNS.items():
+        columns[name] = encode_array(data[column].to_numpy(dtype=np.float32, na_value=np.nan), np.float32)
+
+    return {
+        'rows': len(data),
+        'time_base': time_base,
+        'categories': categories,
+        'days': [str(day) for day in data['Day'].cat.categories],
+        'columns': columns,
+        'figures': figure_templates or {},
+        'cards': card_templates or {},
+    }
+
+
+def figure_templates(data):
+    """Return each client figure drawn from the full dataset, as JSON data.
+
+    The browser keeps their layout and styling and replaces only the trace data.
+    """
+    aggregates = MatchAggregates(data)
+    return {figure_id: json.loads(pio.to_json(FIGURES[figure_id](data, aggregates), validate=False))
+            for figure_id in CLIENT_FIGURES}
@@ -0,0 +1,110 @@
+import io
+
+import pandas as pd
+
+from html_parser import COLUMN_SCHEMA, TIMESTAMP_FORMAT
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# pandas read_csv dtype per schema kind; timestamps and percentages are read
+# as text and converted with their known formats afterwards
+READ_DTYPES = {
+    'datetime': str,
+    'percent': str,
+    'category': 'category',
+    'float32': 'float32',
+    'int32': 'int32',
+}
+
+
+def read_csv(source, columns=None, engine=CSV_ENGINE):
+    """Read a match CSV (path, bytes or file object) with the export's column schema.
+
+    Columns are typed as the HTML parser types them (see COLUMN_SCHEMA), so
+    nothing is inferred. columns, if given, limits the columns read; names
+    missing from the file are ignored. The pyarrow engine parses timestamps
+    and builds categories natively; the C engine is the fallback.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    header = pd.read_csv(source, nrows=0).columns
+    columns = [col for col in header if columns is None or col in columns]
+
+    if engine == 'pyarrow':
+        try:
+            return _read_arrow(source, columns)
+        except ValueError:  # pa.ArrowInvalid: malformed cells, retried below
+            pass
+    return _read_pandas(source, columns)
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
+
+def _read_arrow(source, columns):
+    arrow_types = {
+        'datetime': pa.timestamp('ns'),
+        'percent': pa.string(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'float32': pa.float32(),
+        'int32': pa.int32(),
+    }
+    column_types = {col: arrow_types[COLUMN_SCHEMA[col]] if col in COLUMN_SCHEMA else pa.string()
+                    for col in columns}
+    table = pa_csv.read_csv(_rewind(source), convert_options=pa_csv.ConvertOptions(
+        column_types=column_types,
+        include_columns=columns,
+        timestamp_parsers=[TIMESTAMP_FORMAT],
+        strings_can_be_null=True))
+
+    for col in columns:
+        if COLUMN_SCHEMA.get(col) == 'percent':
+            values = pc.cast(pc.utf8_rtrim(table[col], characters='%'), pa.float32())
+            table = table.set_column(table.schema.get_field_index(col), col,
+                                     pc.divide(values, pa.scalar(100, pa.float32())))
+    frame = table.to_pandas()
+
+    # Dictionaries come in order of first appearance; sort them like pd.Categorical
+    for col in columns:
+        if COLUMN_SCHEMA.get(col) == 'category':
+            frame[col] = frame[col].cat.reorder_categories(frame[col].cat.categories.sort_values())
+    return frame
+
+
+def _read_pandas(source, columns):
+    dtype = {col: READ_DTYPES[COLUMN_SCHEMA[col]] if col in COLUMN_SCHEMA else str
+             for col in columns}
+    try:
+        frame = pd.read_csv(_rewind(source), usecols=columns, dtype=dtype)
+    except ValueError:
+        # Blank or malformed numbers: read them as text and coerce like the HTML parser
+        dtype = {col: str if kind in ('int32', 'float32') else kind for col, kind in dtype.items()}
+        frame = pd.read_csv(_rewind(source), usecols=columns, dtype=dtype)
+        for col in columns:
+            if COLUMN_SCHEMA.get(col) in ('int32', 'float32'):
+                frame[col] = pd.to_numeric(frame[col], errors='coerce')
+
+    for col in columns:
+        kind = COLUMN_SCHEMA.get(col)
+        if kind == 'datetime':
+            frame[col] = convert_timestamps(frame[col])
+        elif kind == 'percent':
+            frame[col] = pd.to_numeric(frame[col].str.rstrip('%'), errors='coerce').astype('float32') / 100
+    return frame
+
+
+def convert_timestamps(values):
+    """Parse export timestamps with their fixed format, guessing only if that fails."""
+    try:
+        return pd.to_datetime(values, format=TIMESTAMP_FORMAT)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, errors='coerce')
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from filter_index import FILTER_DIMENSIONS
+from stats import match_measures, total_measures, combine_totals
+
+DAY_NS = 24 * 60 * 60 * 10**9
+
+# Extra measures for the per-hour K/D chart
+CHART_MEASURES = ['kd_sum', 'kd_count']
+
+
+class StatsCube:
+    """Match measures pre-aggregated per (local date, Operator, Map, Game Type, hour).
+
+    Built once per dataset on top of its FilterIndex, whose category codes
+    key the cells. Cells are sorted by date, so the whole days inside a date
+    range are a contiguous run of cells; the matches on partially covered
+    days at either end are added from the per-match measures. A selection
+    costs O(cells in range + matches on the edge days) rather than O(matches).
+    """
+
+    def __init__(self, data, index):
+        self.index = index
+        self.tz = data['Local Time'].dt.tz
+
+        measures = match_measures(data)
+        kd = data['KD_Ratio'].to_numpy(dtype=np.float64, na_value=np.nan)
+        measures['kd_sum'] = np.nan_to_num(kd)
+        measures['kd_count'] = (~np.isnan(kd)).astype(np.float64)
+        self.row_measures = measures
+        self.row_hours = data['Hour'].to_numpy()
+        # Kill and death totals keep the column dtype, as a pandas group-by sum does
+        self.count_dtype = data['Kills'].dtype
+
+        wall_times = data['Local Time'].dt.tz_localize(None).to_numpy(dtype='datetime64[ns]')
+        keys = pd.DataFrame({
+            'day': wall_times.astype('datetime64[D]').view('i8'),
+            **{dim: index.codes[dim] for dim in FILTER_DIMENSIONS},
+            'hour': self.row_hours,
+        })
+        grouped = pd.DataFrame(measures).groupby([keys[col] for col in keys.columns], sort=True)
+        cells = grouped.sum()
+        cells['best_streak'] = grouped['best_streak'].max()
+        cell_keys = cells.index.to_frame(index=False)
+
+        self.cell_days = cell_keys['day'].to_numpy()
+        self.cell_codes = {dim: cell_keys[dim].to_numpy() for dim in FILTER_DIMENSIONS}
+        self.cell_hours = cell_keys['hour'].to_numpy()
+        self.cell_measures = {name: cells[name].to_numpy() for name in cells.columns}
+
+    def __len__(self):
+        return len(self.cell_days)
+
+    @property
+    def nbytes(self):
+        arrays = [self.cell_days, self.cell_hours, self.row_hours, *self.cell_codes.values(),
+                  *self.cell_measures.values(), *self.row_measures.values()]
+        return sum(array.nbytes for array in arrays)
+
+    def _wall_day(self, moment):
+        """Return (day number, ns into the day) of moment in the dataset's local time."""
+        wall = pd.Timestamp(moment).tz_convert(self.tz).tz_localize(None).value
+        return wall // DAY_NS, wall % DAY_NS
+
+    def _day_start(self, day):
+        """Return the UTC nanoseconds at which local day number day begins."""
+        return pd.Timestamp(day * DAY_NS).tz_localize(self.tz).value
+
+    def select(self, selections, start_time, end_time):
+        """Return the CubeSelection of matches with the selected values in the date range."""
+        index = self.index
+        rows = index.time_slice(start_time, end_time)
+        if rows.start == rows.stop:
+            return CubeSelection(self, np.arange(0), np.arange(0))
+
+        # Days wholly inside the range come from cells, the rest from rows
+        start_day, start_offset = self._wall_day(start_time)
+        end_day, end_offset = self._wall_day(end_time)
+        first_day = start_day + (start_offset > 0)
+        last_day = end_day - (end_offset < DAY_NS - 1)
+        if first_day > last_day:
+            cells = np.arange(0)
+            edge_rows = np.arange(rows.start, rows.stop)
+        else:
+            cells = np.arange(np.searchsorted(self.cell_days, first_day, side='left'),
+                              np.searchsorted(self.cell_days, last_day, side='right'))
+            inner_start = np.searchsorted(index.times, self._day_start(first_day), side='left')
+            inner_stop = np.searchsorted(index.times, self._day_start(last_day + 1), side='left')
+            edge_rows = np.concatenate([np.arange(rows.start, max(rows.start, inner_start)),
+                                        np.arange(min(inner_stop, rows.stop), rows.stop)])
+
+        for dim, selected in index.lookup_tables(selections).items():
+            cells = cells[selected[self.cell_codes[dim][cells]]]
+            edge_rows = edge_rows[selected[index.codes[dim][edge_rows]]]
+        return CubeSelection(self, cells, edge_rows)
+
+
+class CubeSelection:
+    """The cells and edge-day rows of a StatsCube that one filter state covers."""
+
+    def __init__(self, cube, cells, rows):
+        self.cube = cube
+        self.cells = cells
+        self.rows = rows
+
+    def totals(self):
+        """Return the stats totals (see stats.stats_from_totals) of the selection."""
+        cube = self.cube
+        return combine_totals(total_measures(cube.cell_measures, self.cells),
+                              total_measures(cube.row_measures, self.rows))
+
+    def _sum_by(self, cell_keys, row_keys, size, names):
+        """Sum measures per key; cell_keys and row_keys are the selected cells' and rows' keys."""
+        cube = self.cube
+        return {name: (np.bincount(cell_keys, cube.cell_measures[name][self.cells], size)
+                       + np.bincount(row_keys, cube.row_measures[name][self.rows], size))
+                for name in names}
+
+    @property
+    def by_hour(self):
+        """Mean K/D ratio per hour of day, as MatchAggregates.by_hour."""
+        cube = self.cube
+        sums = self._sum_by(cube.cell_hours[self.cells], cube.row_hours[self.rows], 24, CHART_MEASURES)
+        present = sums['kd_count'] > 0
+        return pd.Series(sums['kd_sum'][present] / sums['kd_count'][present],
+                         index=pd.Index(np.flatnonzero(present).astype(np.int8), name='Hour'),
+                         name='KD_Ratio')
+
+    @property
+    def by_map(self):
+        """Total kills and deaths per map, as MatchAggregates.by_map."""
+        cube = self.cube
+        categories = cube.index.categories['Map']
+        size = len(categories) + 1  # last slot collects missing maps (-1)
+        sums = self._sum_by(cube.cell_codes['Map'][self.cells] % size,
+                            cube.index.codes['Map'][self.rows] % size,
+                            size, ['kills', 'deaths', 'matches'])
+        present = np.flatnonzero(sums['matches'][:-1] > 0)
+        return pd.DataFrame({'Kills': sums['kills'][present].astype(cube.count_dtype),
+                             'Deaths': sums['deaths'][present].astype(cube.count_dtype)},
+                            index=pd.CategoricalIndex(categories[present], categories=categories,
+                                                      name='Map'))
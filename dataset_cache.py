@@ -0,0 +1,133 @@
+import hashlib
+import os
+import threading
+import uuid
+import pandas as pd
+
+try:
+    from pyarrow import feather
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+# Bump when the processed frame layout changes so stale entries are ignored
+CACHE_VERSION = '4'
+
+
+def content_key(content, *parts):
+    """Return the SHA-256 cache key for raw upload bytes plus extra key parts."""
+    return digest_key(hashlib.sha256(content), *parts)
+
+
+def digest_key(digest, *parts):
+    """Return the cache key for a hashlib SHA-256 of the upload bytes, as content_key."""
+    digest = digest.copy()
+    for part in (CACHE_VERSION,) + parts:
+        digest.update(b'\0' + str(part).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """Content-addressed on-disk cache of processed match frames.
+
+    Entries are Feather files (pickle when pyarrow is missing) named by
+    content key. Reads refresh the file's mtime and the oldest files are
+    evicted once the directory grows past max_bytes. The directory may be
+    shared by several worker processes.
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = '.feather' if HAVE_ARROW else '.pkl'
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key):
+        """Return the cached frame for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            if HAVE_ARROW:
+                frame = feather.read_feather(path, memory_map=True)
+            else:
+                frame = pd.read_pickle(path)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Missing, half-evicted or unreadable entries count as misses
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return frame
+
+    def put(self, key, frame):
+        """Store frame under key and evict old entries; returns False on failure."""
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            if HAVE_ARROW:
+                frame.reset_index(drop=True).to_feather(tmp_path)
+            else:
+                frame.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        # Kept even when it alone exceeds max_bytes: other workers load the
+        # dataset by this key
+        self.evict(keep=path)
+        return True
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.extension):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits max_bytes.
+
+        The entry at path keep is never deleted.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Delete every cached frame."""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        """Return hit/miss counters and current disk usage."""
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+        }
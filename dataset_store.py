@@ -0,0 +1,116 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+def frame_nbytes(frame):
+    """Return the in-memory size of a DataFrame in bytes."""
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def value_nbytes(value):
+    """Return an estimate of the in-memory size of a derived value in bytes.
+
+    Values with an nbytes attribute (arrays, FilterIndex, StatsCube) report
+    it; containers such as the clientside payload are walked, counting the
+    length of their strings, which hold the encoded columns.
+    """
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(value_nbytes(key) + value_nbytes(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(value_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class DatasetStore:
+    """In-process LRU of loaded datasets keyed by dataset ID.
+
+    Entries are evicted least recently used first once their combined size
+    passes max_bytes; the most recent entry is always kept. Structures built
+    from a dataset (see derived) live and die with its entry. On a miss the
+    optional loader (e.g. DatasetCache.get) is asked for the frame, which lets
+    every worker process serve any session from a shared directory.
+    """
+
+    def __init__(self, max_bytes=512 << 20, loader=None):
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, dataset_id):
+        return dataset_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def put(self, dataset_id, frame):
+        """Add or replace a dataset and evict old ones to stay under the cap."""
+        size = frame_nbytes(frame)
+        with self._lock:
+            if dataset_id in self._entries:
+                self.nbytes -= self._entries.pop(dataset_id)['nbytes']
+            self._entries[dataset_id] = {'frame': frame, 'nbytes': size, 'derived': {}}
+            self.nbytes += size
+            self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted['nbytes']
+
+    def get(self, dataset_id):
+        """Return the dataset for dataset_id, or None if it is unknown."""
+        if dataset_id is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is not None:
+                self._entries.move_to_end(dataset_id)
+                return entry['frame']
+            if self.loader is None:
+                return None
+            loading = self._loading.setdefault(dataset_id, threading.Lock())
+        # Callbacks that miss on the same dataset at once wait for one load
+        with loading:
+            with self._lock:
+                entry = self._entries.get(dataset_id)
+            if entry is not None:
+                return entry['frame']
+            try:
+                frame = self.loader(dataset_id)
+                if frame is not None:
+                    self.put(dataset_id, frame)
+            finally:
+                with self._lock:
+                    self._loading.pop(dataset_id, None)
+        return frame
+
+    def derived(self, dataset_id, name, build):
+        """Return build(frame) for a dataset, built once and kept with its entry.
+
+        Returns None if the dataset is unknown.
+        """
+        frame = self.get(dataset_id)
+        if frame is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is not None and name in entry['derived']:
+                return entry['derived'][name]
+        value = build(frame)
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is not None and entry['frame'] is frame and name not in entry['derived']:
+                entry['derived'][name] = value
+                size = value_nbytes(value)
+                entry['nbytes'] += size
+                self.nbytes += size
+                self._evict()
+        return value
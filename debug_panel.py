@@ -0,0 +1,81 @@
+from dash import html, dcc, Input, Output, callback, callback_context
+import dash_bootstrap_components as dbc
+
+REFRESH_INTERVAL_MS = 2000
+
+
+def debug_panel(instrumentation):
+    """Return the instrumentation panel shown below the charts."""
+    return dbc.Card([
+        dbc.CardBody([
+            html.H3("Instrumentation",
+                    className="mb-3",
+                    style={'color': 'var(--accent-color)', 'fontSize': '1.2rem'}),
+            dcc.Interval(id='debug-refresh', interval=REFRESH_INTERVAL_MS),
+            html.Div(id='debug-timings'),
+            dbc.Row([
+                dbc.Col(dbc.Switch(id='debug-profile', label='Profile a sample of callbacks',
+                                   value=instrumentation.profile_rate > 0), width='auto'),
+                dbc.Col(dbc.InputGroup([
+                    dbc.InputGroupText('Sample rate'),
+                    dbc.Input(id='debug-profile-rate', type='number', min=0.01, max=1,
+                              step=0.01, value=instrumentation.profile_rate or 0.1),
+                ], size='sm'), width=3),
+                dbc.Col(dbc.Button('Reset profile', id='debug-profile-reset',
+                                   color='secondary', size='sm'), width='auto'),
+                dbc.Col(html.Span(id='debug-profile-status',
+                                  style={'color': 'var(--text-secondary)'})),
+            ], className='my-3 align-items-center'),
+            html.Pre(id='debug-profile-text',
+                     style={'maxHeight': '400px', 'overflow': 'auto', 'fontSize': '0.75rem',
+                            'color': 'var(--text-secondary)'})
+        ])
+    ], className="stats-card mt-4")
+
+
+def timings_table(summary):
+    def value(number, scale=1, digits=0):
+        return '' if number is None else f'{number * scale:,.{digits}f}'
+
+    header = html.Thead(html.Tr([html.Th(label) for label in
+                                 ('Stage', 'Calls', 'Mean ms', 'Max ms', 'Rows in', 'Rows out',
+                                  'Payload KB')]))
+    rows = [html.Tr([html.Td(name), html.Td(stage['count']),
+                     html.Td(value(stage['mean_seconds'], 1000, 1)),
+                     html.Td(value(stage['max_seconds'], 1000, 1)),
+                     html.Td(value(stage['rows_in'])), html.Td(value(stage['rows_out'])),
+                     html.Td(value(stage['payload_bytes'], 1 / 1024, 1))])
+            for name, stage in sorted(summary.items())]
+    return dbc.Table([header, html.Tbody(rows)], size='sm', striped=True, className='mb-0')
+
+
+def register_debug_callbacks(instrumentation):
+    """Wire the panel to an Instrumentation; call once, when the panel is in the layout."""
+    @callback(
+        [Output('debug-timings', 'children'),
+         Output('debug-profile-text', 'children')],
+        Input('debug-refresh', 'n_intervals')
+    )
+    def refresh_debug_panel(n_intervals):
+        summary = instrumentation.summary()
+        if not summary:
+            timings = html.Div("No instrumented callbacks yet",
+                               style={'color': 'var(--text-secondary)'})
+        else:
+            timings = timings_table(summary)
+        return timings, instrumentation.profile_text()
+
+    @callback(
+        Output('debug-profile-status', 'children'),
+        [Input('debug-profile', 'value'),
+         Input('debug-profile-rate', 'value'),
+         Input('debug-profile-reset', 'n_clicks')],
+        prevent_initial_call=True
+    )
+    def configure_profiling(enabled, rate, reset_clicks):
+        if callback_context.triggered_id == 'debug-profile-reset':
+            instrumentation.reset_profile()
+        instrumentation.profile_rate = min(max(rate or 0, 0), 1) if enabled else 0.0
+        if not instrumentation.profile_rate:
+            return "Profiling off"
+        return f"Profiling {instrumentation.profile_rate:.0%} of callbacks"
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """Return the indices kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; the points in between are split
+    into threshold - 2 buckets and from each bucket the point forming the
+    largest triangle with the previously kept point and the mean of the next
+    bucket is chosen.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    kept = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs((x[kept] - next_x) * (y[start:end] - y[kept])
+                      - (x[kept] - x[start:end]) * (next_y - y[kept]))
+        kept = start + int(np.argmax(area))
+        indices[i + 1] = kept
+    return indices
+
+
+def downsample_frame(frame, x, y_columns, threshold):
+    """Return the rows of frame kept when downsampling each y column over x.
+
+    Rows with a missing y value are dropped from that column's series; the
+    kept rows of all columns are merged so every trace stays exact at the
+    points chosen for any of them. A threshold of None keeps every row.
+    """
+    if threshold is None or len(frame) <= threshold:
+        return frame
+    x_values = frame[x].to_numpy(dtype='datetime64[ns]').view('i8')
+    keep = []
+    for column in y_columns:
+        y_values = frame[column].to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(np.isfinite(y_values))
+        keep.append(valid[lttb(x_values[valid], y_values[valid], threshold)])
+    return frame.iloc[np.unique(np.concatenate(keep))]
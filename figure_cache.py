@@ -0,0 +1,66 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import plotly.io as pio
+
+
+class FigureCache:
+    """Bounded LRU of serialised figures with a time-to-live.
+
+    Figures are stored as plain JSON-compatible dicts so a hit can be returned
+    to Dash without touching pandas or plotly. Entries expire ttl seconds after
+    they were stored, and the least recently used ones are dropped once the
+    serialised size of all entries passes max_bytes.
+    """
+
+    def __init__(self, max_bytes=64 << 20, ttl=600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached figure dict for key, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, figure):
+        """Serialise figure, store it under key and return the stored dict."""
+        serialised = pio.to_json(figure, validate=False)
+        value = json.loads(serialised)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, len(serialised))
+            self.nbytes += len(serialised)
+            self._evict()
+        return value
+
+    def _remove(self, key):
+        self.nbytes -= self._entries.pop(key)[2]
+
+    def _evict(self):
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry[0] < now]:
+            self._remove(key)
+        while self.nbytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
@@ -0,0 +1,38 @@
+import hashlib
+import json
+
+from dash import Patch
+
+# Scalar trace properties that are computed from the data, such as the
+# fitted line equations in the damage chart's hover text
+DATA_TEXT_PROPERTIES = {'hovertemplate', 'text'}
+
+
+def is_data(name, value):
+    """Return whether a trace property holds data: a list, a plotly typed array or data text."""
+    return (isinstance(value, list) or (isinstance(value, dict) and 'bdata' in value)
+            or name in DATA_TEXT_PROPERTIES)
+
+
+def figure_shape(figure):
+    """Return a digest of a figure dict with its trace data left out.
+
+    Two figures with the same shape differ only in trace data, so one can be
+    turned into the other by data_patch.
+    """
+    shape = {
+        'layout': figure.get('layout', {}),
+        'data': [{name: None if is_data(name, value) else value for name, value in trace.items()}
+                 for trace in figure.get('data', [])],
+    }
+    return hashlib.sha1(json.dumps(shape, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def data_patch(figure):
+    """Return a Patch that sets only the trace data of a figure dict."""
+    patch = Patch()
+    for position, trace in enumerate(figure.get('data', [])):
+        for name, value in trace.items():
+            if is_data(name, value):
+                patch['data'][position][name] = value
+    return patch
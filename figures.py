@@ -0,0 +1,302 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# plotly.express is imported inside the builders that use it: it is slow to
+# import and not needed until the first figure is drawn
+
+from aggregates import AGGREGATE_COLUMNS, MatchAggregates
+from downsample import downsample_frame
+
+# Set default plot dimensions
+PLOT_HEIGHT = 300
+PLOT_WIDTH = 490
+
+
+def hour_label(hour):
+    """Format an hour of day in 12-hour format."""
+    return f"{hour if 0 < hour < 12 else 12 if hour == 12 else hour-12} {'AM' if hour < 12 else 'PM'}"
+
+
+def empty_figure():
+    """Return a blank dark figure for a selection without matches."""
+    return go.Figure(layout=dict(template="plotly_dark", height=PLOT_HEIGHT, width=PLOT_WIDTH))
+
+
+def histogram_figure(counts, edges, title, xaxis_title, color):
+    """Draw pre-binned counts as a histogram-style bar chart."""
+    histogram = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color=color,
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate='%{customdata[0]:.3g} - %{customdata[1]:.3g}<br>Matches: %{y}<extra></extra>'
+    ))
+    histogram.update_layout(
+        title=title,
+        height=PLOT_HEIGHT,
+        width=PLOT_WIDTH,
+        bargap=0,
+        xaxis_title=xaxis_title,
+        yaxis_title='Number of Matches',
+        template="plotly_dark"
+    )
+    return histogram
+
+
+# Skill progression over time
+def skill_figure(filtered_data, aggregates, threshold=PLOT_WIDTH):
+    import plotly.express as px
+    skill_plot = px.line(
+        downsample_frame(filtered_data, 'Local Time', ['Skill'], threshold),
+        x='Local Time',
+        y='Skill',
+        title="Skill Progression Over Time",
+        height=PLOT_HEIGHT,
+        width=PLOT_WIDTH,
+        color_discrete_sequence=['#5B9AFF']
+    )
+    skill_plot.update_traces(line_width=2)
+    skill_plot.update_layout(
+        template="plotly_dark",
+        xaxis_title='Time',
+        yaxis_title='Skill Rating'
+    )
+    return skill_plot
+
+
+# KD ratio by hour as a bar chart with 12-hour format
+def kd_by_hour_figure(filtered_data, aggregates):
+    import plotly.express as px
+    hourly_data = aggregates.by_hour.reset_index()
+    hourly_data['Hour_12'] = hourly_data['Hour'].apply(hour_label)
+    kd_by_hour = px.bar(
+        hourly_data,
+        x='Hour_12',
+        y='KD_Ratio',
+        title="Average K/D Ratio by Hour",
+        height=PLOT_HEIGHT,
+        width=PLOT_WIDTH,
+        color_discrete_sequence=['#00ff00']
+    )
+    kd_by_hour.update_layout(
+        xaxis_title='Hour of Day',
+        yaxis_title='Average K/D Ratio',
+        template="plotly_dark",
+        xaxis_tickangle=45
+    )
+    return kd_by_hour
+
+
+# Accuracy distribution
+def accuracy_histogram(filtered_data, aggregates):
+    valid_accuracy = (
+        (filtered_data['Accuracy'] >= 0) &
+        (filtered_data['Accuracy'] <= 1) &
+        (filtered_data['Shots'] > 0)
+    ).to_numpy()
+    counts, edges = aggregates.histogram('Accuracy', mask=valid_accuracy)
+    return histogram_figure(counts, edges, "Accuracy Distribution", 'Accuracy %', 'orange')
+
+
+# K/D distribution
+def kd_histogram(filtered_data, aggregates):
+    counts, edges = aggregates.histogram('KD_Ratio')
+    return histogram_figure(counts, edges, "K/D Ratio Distribution", 'K/D Ratio', 'red')
+
+
+# Skill distribution
+def skill_histogram(filtered_data, aggregates):
+    counts, edges = aggregates.histogram('Skill')
+    return histogram_figure(counts, edges, "Skill Distribution", 'Skill Rating', 'cyan')
+
+
+# Performance metrics over time
+def metrics_figure(filtered_data, aggregates, threshold=PLOT_WIDTH):
+    import plotly.express as px
+    metrics_plot = px.line(
+        downsample_frame(filtered_data, 'Local Time', ['KD_Ratio', 'Accuracy'], threshold),
+        x='Local Time',
+        y=['KD_Ratio', 'Accuracy'],
+        title="Performance Metrics Over Time",
+        height=PLOT_HEIGHT,
+        width=PLOT_WIDTH
+    )
+    metrics_plot.update_traces(line_width=2)
+    metrics_plot.update_layout(template="plotly_dark")
+    return metrics_plot
+
+
+# Map K/D performance
+def map_performance_figure(filtered_data, aggregates):
+    import plotly.express as px
+    map_stats = aggregates.by_map.reset_index()
+
+    # Calculate KD ratio safely, replacing 0 deaths with 1
+    map_stats['KD'] = (map_stats['Kills'] / map_stats['Deaths'].replace(0, 1)).round(2)
+
+    # Sort by KD ratio; a stable sort keeps tied maps in map order, as the
+    # clientside version of this chart does
+    map_stats = map_stats.sort_values('KD', ascending=True, kind='stable')
+
+    map_performance = px.bar(
+        map_stats,
+        x='Map',
+        y='KD',
+        title="K/D Ratio by Map",
+        height=PLOT_HEIGHT,
+        width=PLOT_WIDTH,
+        color_discrete_sequence=['purple']
+    )
+    map_performance.update_layout(
+        xaxis_title='Map',
+        yaxis_title='K/D Ratio',
+        template="plotly_dark",
+        xaxis_tickangle=45
+    )
+    return map_performance
+
+
+# Headshot ratio over time
+def headshot_figure(filtered_data, aggregates, threshold=PLOT_WIDTH):
+    import plotly.express as px
+    headshot_plot = px.line(
+        downsample_frame(filtered_data, 'Local Time', ['Headshot_Ratio'], threshold),
+        x='Local Time',
+        y='Headshot_Ratio',
+        title="Headshot Ratio Over Time",
+        height=PLOT_HEIGHT,
+        width=PLOT_WIDTH
+    )
+    headshot_plot.update_traces(line_color='#ff4d4d', line_width=2)
+    headshot_plot.update_layout(
+        yaxis_title='Headshot Ratio',
+        template="plotly_dark"
+    )
+    return headshot_plot
+
+
+# Damage efficiency (damage done vs taken)
+def damage_figure(filtered_data, aggregates):
+    import plotly.express as px
+    damage_plot = px.scatter(
+        filtered_data,
+        x='Damage Taken',
+        y='Damage Done',
+        title="Damage Efficiency",
+        height=PLOT_HEIGHT,
+        width=PLOT_WIDTH,
+        color='Match Outcome',
+        # Outcomes in a fixed order keep their colours, and the figure's
+        # shape, when the filters change
+        category_orders={'Match Outcome': sorted(filtered_data['Match Outcome'].dropna().unique())}
+    )
+
+    # One least squares line per outcome, from grouped sufficient statistics
+    if aggregates is None:
+        aggregates = MatchAggregates(filtered_data)
+    fits = aggregates.trend_stats('Damage Taken', 'Damage Done', 'Match Outcome').fit()
+    for trace in list(damage_plot.data):
+        if trace.name not in fits.index:
+            continue
+        fit = fits.loc[trace.name]
+        x = [fit['min_x'], fit['max_x']]
+        damage_plot.add_trace(go.Scatter(
+            x=x,
+            y=[fit['slope'] * value + fit['intercept'] for value in x],
+            mode='lines',
+            name=trace.name,
+            legendgroup=trace.legendgroup,
+            showlegend=False,
+            line_color=trace.marker.color,
+            hovertemplate=(f"<b>OLS trendline</b><br>Damage Done = {fit['slope']:.4g} * Damage Taken "
+                           f"+ {fit['intercept']:.4g}<extra>{trace.name}</extra>")
+        ))
+    damage_plot.update_layout(
+        template="plotly_dark",
+        showlegend=True
+    )
+    return damage_plot
+
+
+# Match outcomes pie chart
+def outcome_figure(filtered_data, aggregates):
+    import plotly.express as px
+    # Most frequent first; ties keep the category order, as the clientside
+    # mode's copy of this chart does
+    outcome_stats = filtered_data['Match Outcome'].value_counts(sort=False)
+    outcome_stats = outcome_stats[outcome_stats > 0].sort_values(ascending=False, kind='stable')  # Drop unused categories
+    outcome_plot = px.pie(
+        values=outcome_stats.values,
+        names=outcome_stats.index,
+        title="Match Outcomes Distribution",
+        height=PLOT_HEIGHT,
+        width=PLOT_WIDTH,
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    outcome_plot.update_layout(template="plotly_dark")
+    return outcome_plot
+
+
+# Activity heatmap by day of week and hour
+def activity_heatmap_figure(filtered_data, aggregates):
+    # Monday-first day x hour match counts
+    activity_pivot = aggregates.day_hour
+
+    # Convert hour numbers to 12-hour format for heatmap
+    hour_labels = [hour_label(h) for h in activity_pivot.columns]
+
+    activity_heatmap = go.Figure(data=go.Heatmap(
+        z=activity_pivot.values,
+        x=hour_labels,
+        y=activity_pivot.index,
+        colorscale='Viridis',
+        hoverongaps=False
+    ))
+
+    activity_heatmap.update_layout(
+        title='Gaming Activity Heatmap',
+        xaxis_title='Hour of Day',
+        yaxis_title='Day of Week',
+        height=400,
+        template="plotly_dark",
+        xaxis_tickangle=45
+    )
+    return activity_heatmap
+
+
+# Time-series charts are downsampled to threshold points, by default about
+# one per pixel of width; zooming re-fetches the visible window with a higher
+# threshold (see analysis.resample_time_series)
+TIME_SERIES_FIGURES = ['skill-plot', 'metrics-plot', 'headshot-plot']
+
+# Processed columns each figure reads, directly or through MatchAggregates
+FIGURE_COLUMNS = {
+    'skill-plot': ['Local Time', 'Skill'],
+    'kd-by-hour-plot': AGGREGATE_COLUMNS,
+    'accuracy-hist': ['Accuracy', 'Shots'],
+    'kd-hist': ['KD_Ratio'],
+    'skill-hist': ['Skill'],
+    'metrics-plot': ['Local Time', 'KD_Ratio', 'Accuracy'],
+    'map-performance': AGGREGATE_COLUMNS,
+    'headshot-plot': ['Local Time', 'Headshot_Ratio'],
+    'damage-plot': ['Damage Taken', 'Damage Done', 'Match Outcome'],
+    'outcome-plot': ['Match Outcome'],
+    'activity-heatmap': AGGREGATE_COLUMNS,
+}
+
+# Figure builders by graph id, in grid order; each takes the filtered rows and
+# their MatchAggregates
+FIGURES = {
+    'skill-plot': skill_figure,
+    'kd-by-hour-plot': kd_by_hour_figure,
+    'accuracy-hist': accuracy_histogram,
+    'kd-hist': kd_histogram,
+    'skill-hist': skill_histogram,
+    'metrics-plot': metrics_figure,
+    'map-performance': map_performance_figure,
+    'headshot-plot': headshot_figure,
+    'damage-plot': damage_figure,
+    'outcome-plot': outcome_figure,
+    'activity-heatmap': activity_heatmap_figure,
+}
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+# Checklist filters of the dashboard, by column
+FILTER_DIMENSIONS = ['Operator', 'Game Type', 'Map']
+
+
+class FilterIndex:
+    """Precomputed row index for the checklist and date range filters.
+
+    Each filter dimension is stored as integer category codes, so a checklist
+    selection becomes a boolean lookup table indexed by code. 'Local Time' is
+    kept as a sorted int64 array (the processed frame is sorted by time) and a
+    date range is resolved by binary search to a contiguous row slice.
+    """
+
+    def __init__(self, data, dimensions=FILTER_DIMENSIONS):
+        self.codes = {}
+        self.categories = {}
+        self.has_missing = {}
+        for dim in dimensions:
+            column = data[dim]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                codes, categories = column.cat.codes.to_numpy(), column.cat.categories
+            else:
+                codes, categories = pd.factorize(column)
+            self.codes[dim] = codes
+            self.categories[dim] = pd.Index(categories)
+            self.has_missing[dim] = bool((codes < 0).any())
+
+        utc_times = data['Local Time'].dt.tz_convert('UTC')
+        self.times = utc_times.to_numpy(dtype='datetime64[ns]').view('i8')
+        if len(self.times) > 1 and (np.diff(self.times) < 0).any():
+            raise ValueError("FilterIndex needs data sorted by 'Local Time'")
+
+    @property
+    def nbytes(self):
+        return self.times.nbytes + sum(codes.nbytes for codes in self.codes.values())
+
+    def time_slice(self, start_time, end_time):
+        """Return the row slice with start_time <= 'Local Time' <= end_time."""
+        if pd.isna(start_time) or pd.isna(end_time):
+            return slice(0, 0)
+        start = np.searchsorted(self.times, pd.Timestamp(start_time).value, side='left')
+        end = np.searchsorted(self.times, pd.Timestamp(end_time).value, side='right')
+        return slice(start, max(start, end))
+
+    def lookup_tables(self, selections):
+        """Return {dimension: boolean table indexed by code} for the selections.
+
+        Tables have one extra last slot for missing values (code -1).
+        Dimensions where every value is selected are left out.
+        """
+        tables = {}
+        for dim, values in selections.items():
+            categories = self.categories[dim]
+            selected = np.zeros(len(categories) + 1, dtype=bool)
+            selected[categories.get_indexer(categories.intersection(values))] = True
+            if selected[:-1].all() and not self.has_missing[dim]:
+                continue
+            tables[dim] = selected
+        return tables
+
+    def select(self, selections, start_time, end_time):
+        """Return the positions of rows matching every selection and the date range.
+
+        selections maps a filter dimension to the list of selected values.
+        """
+        rows = self.time_slice(start_time, end_time)
+        mask = None
+        for dim, selected in self.lookup_tables(selections).items():
+            dim_mask = selected[self.codes[dim][rows]]
+            mask = dim_mask if mask is None else mask & dim_mask
+        if mask is None:
+            return np.arange(rows.start, rows.stop)
+        return rows.start + np.flatnonzero(mask)
@@ -0,0 +1,47 @@
+import io
+import pickle
+
+
+def _pyarrow():
+    # Looked up on each call: in the browser build pyarrow may be loaded
+    # after this module is imported
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def frame_formats():
+    """Return the formats decode_frame can read here, preferred first."""
+    return ['arrow', 'pickle'] if _pyarrow() is not None else ['pickle']
+
+
+def encode_frame(frame, formats=None):
+    """Serialise a processed frame for another process or worker.
+
+    Returns (format, bytes): an Arrow IPC stream when pyarrow is available
+    and the receiver lists 'arrow' in formats (its frame_formats()), else a
+    pickle. The receiver needs the same pandas version for pickles.
+    """
+    pa = _pyarrow()
+    if pa is not None and (formats is None or 'arrow' in formats):
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return 'arrow', sink.getvalue().to_pybytes()
+    return 'pickle', pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_frame(format, data):
+    """Rebuild a frame serialised by encode_frame from bytes or a buffer."""
+    if format == 'arrow':
+        pa = _pyarrow()
+        if pa is None:
+            raise ValueError("Arrow frames need pyarrow")
+        with pa.ipc.open_stream(pa.py_buffer(data)) as reader:
+            return reader.read_pandas()
+    if format == 'pickle':
+        return pickle.load(io.BytesIO(data))
+    raise ValueError(f"Unknown frame format: {format}")
@@ -1,81 +1,312 @@
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+import codecs
+import numpy as np
 import pandas as pd
-import datetime
-import pytz
 
-def parse_html_file(html_content):
+# Headings that lead to the match table, in document order
+SECTION_HEADINGS = [
+    ('h1', "Copy of Your Data"),
+    ('h1', " Call of Duty: Black Ops 6"),
+    ('h2', "Multiplayer Match Data (reverse chronological)"),
+]
+
+SECTION_ERRORS = [
+    "Could not find Copy of Your Data section",
+    "Could not find Call of Duty: Black Ops 6 heading",
+    "Could not find Multiplayer Match Data heading",
+    "Could not find match data table",
+]
+
+# Read size used when streaming the export
+CHUNK_SIZE = 1 << 20
+
+# Timestamps in the export look like "2025-01-09 4:19:58"
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Final dtype of every typed column; anything not listed stays a string
+COLUMN_SCHEMA = {
+    'UTC Timestamp': 'datetime',
+    'Match Start Timestamp': 'datetime',
+    'Match End Timestamp': 'datetime',
+    'Account Type': 'category',
+    'Device Type': 'category',
+    'Game Type': 'category',
+    'Map': 'category',
+    'Team': 'category',
+    'Match Outcome': 'category',
+    'Operator': 'category',
+    'Operator Skin': 'category',
+    'Execution': 'category',
+    'Skill': 'float32',
+    'Percentage Of Time Moving': 'percent',
+}
+for _col in ['Score', 'Kills', 'Deaths', 'Shots', 'Hits',
+             'Headshots', 'Damage Done', 'Damage Taken',
+             'Longest Streak', 'Lifetime Kills', 'Lifetime Deaths',
+             'Lifetime Time Played', 'Assists', 'Executions', 'Suicides',
+             'Armor Collected', 'Armor Equipped', 'Armor Destroyed',
+             'Ground Vehicles Used', 'Air Vehicles Used',
+             'Total XP', 'Score XP', 'Challenge XP', 'Match XP',
+             'Medal XP', 'Bonus XP', 'Misc XP', 'Accolade XP',
+             'Weapon XP', 'Operator XP', 'Clan XP', 'Battle Pass XP',
+             'Rank at Start', 'Rank at End', 'XP at Start', 'XP at End',
+             'Score at Start', 'Score at End', 'Prestige at Start', 'Prestige at End',
+             'Lifetime Wall Bangs', 'Lifetime Games Played', 'Lifetime Wins',
+             'Lifetime Losses', 'Lifetime Hits', 'Lifetime Misses', 'Lifetime Near Misses']:
+    COLUMN_SCHEMA[_col] = 'int32'
+
+
+class MatchTableParser(HTMLParser):
+    """Event-driven parser that only keeps the multiplayer match table.
+
+    Everything before the match table is scanned without being stored and
+    parsing stops at the closing </table>, so the rest of the document is
+    never materialised. With known_match_ids, parsing also stops at the first
+    row whose Match ID is already known: the table is reverse chronological,
+    so every later row is older. With columns, the text of cells in other
+    columns is never gathered.
+    """
+
+    def __init__(self, known_match_ids=None, columns=None):
+        super().__init__(convert_charrefs=True)
+        self.stage = 0          # index into SECTION_HEADINGS, then the table
+        self.done = False
+        self.known_match_ids = known_match_ids
+        self.projection = columns
+        self._match_id_column = None
+        self._wanted = None
+        self.headers = []
+        self.keep = None        # indices of the kept headers
+        self.columns = None
+        self._heading_text = None
+        self._in_table = False
+        self._row_count = 0
+        self._cells = None
+        self._cell_tag = None
+        self._cell_text = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self.stage < len(SECTION_HEADINGS):
+            if tag == SECTION_HEADINGS[self.stage][0]:
+                self._heading_text = []
+            return
+        if not self._in_table:
+            if tag == 'table':
+                self._in_table = True
+            return
+        if tag == 'tr':
+            self._end_row()
+            self._cells = []
+            self._row_count += 1
+        elif tag in ('td', 'th'):
+            self._end_cell()
+            if tag == 'td' and self._cells is not None and not self._is_wanted(len(self._cells)):
+                self._cells.append(None)
+                return
+            self._cell_tag = tag
+            self._cell_text = []
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if self.stage < len(SECTION_HEADINGS):
+            expected_tag, expected_text = SECTION_HEADINGS[self.stage]
+            if tag == expected_tag and self._heading_text is not None:
+                if ''.join(self._heading_text) == expected_text:
+                    self.stage += 1
+                self._heading_text = None
+            return
+        if not self._in_table:
+            return
+        if tag in ('td', 'th'):
+            self._end_cell()
+        elif tag == 'tr':
+            self._end_row()
+        elif tag == 'table':
+            self._end_row()
+            self._in_table = False
+            self.done = True
+
+    def handle_data(self, text):
+        if self._cell_text is not None:
+            self._cell_text.append(text)
+        elif self._heading_text is not None:
+            self._heading_text.append(text)
+
+    def _is_wanted(self, index):
+        if self.projection is None:
+            return True
+        if self._wanted is None:
+            wanted = set(self.projection)
+            if self.known_match_ids is not None:
+                wanted.add('Match ID')
+            self._wanted = [header in wanted for header in self.headers]
+        return index >= len(self._wanted) or self._wanted[index]
+
+    def selected_headers(self):
+        """Return the headers of the columns kept by the projection."""
+        if self.projection is None:
+            return self.headers
+        self._is_wanted(0)
+        return [header for header, wanted in zip(self.headers, self._wanted) if wanted]
+
+    def _end_cell(self):
+        if self._cell_text is None:
+            return
+        text = ''.join(self._cell_text).strip()
+        if self._cell_tag == 'th':
+            self.headers.append(text)
+        elif self._cells is not None:
+            self._cells.append(text)
+        self._cell_tag = None
+        self._cell_text = None
+
+    def _end_row(self):
+        self._end_cell()
+        # Skip the header row, like the BeautifulSoup path does
+        if self._cells and self._row_count > 1:
+            self._append_row(self._cells)
+        self._cells = None
+
+    def _append_row(self, cells):
+        if self.columns is None:
+            self.keep = [i for i in range(len(self.headers)) if self._is_wanted(i)]
+            self.columns = [[] for _ in self.keep]
+            if self.known_match_ids is not None and 'Match ID' in self.headers:
+                self._match_id_column = self.headers.index('Match ID')
+        if self._match_id_column is not None and self._match_id_column < len(cells):
+            if cells[self._match_id_column] in self.known_match_ids:
+                self._in_table = False
+                self.done = True
+                return
+        for i, column in zip(self.keep, self.columns):
+            column.append(cells[i] if i < len(cells) else None)
+
+
+def _iter_chunks(source, chunk_size):
+    """Yield (text chunk, amount of source read so far) from a str, bytes or file object."""
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size], min(start + chunk_size, len(source))
+        return
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), chunk_size):
+            yield decoder.decode(view[start:start + chunk_size]), min(start + chunk_size, len(view))
+        position = len(view)
+    else:
+        position = 0
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            position += len(chunk)
+            yield chunk if isinstance(chunk, str) else decoder.decode(chunk), position
+    yield decoder.decode(b'', final=True), position
+
+
+def parse_html_stream(source, chunk_size=CHUNK_SIZE, known_match_ids=None, columns=None,
+                      progress=None):
+    """Parse the match table from a str, bytes or file object incrementally.
+
+    known_match_ids is an optional set of Match ID strings; only the rows
+    above the first known match are returned. columns, if given, limits the
+    columns extracted; names missing from the table are ignored. progress,
+    if given, is called as progress(rows, position) after each chunk, with
+    the number of rows parsed and the amount of the source read.
+    """
+    parser = MatchTableParser(known_match_ids, columns)
+    for chunk, position in _iter_chunks(source, chunk_size):
+        parser.feed(chunk)
+        if progress is not None:
+            progress(len(parser.columns[0]) if parser.columns else 0, position)
+        if parser.done:
+            break
+    if not parser.done:
+        parser.close()
+    if not parser.done and not parser._in_table:
+        raise ValueError(SECTION_ERRORS[parser.stage])
+
+    headers = parser.selected_headers()
+    return build_frame(headers, parser.columns or [[] for _ in headers])
+
+
+def parse_html_file(html_content, streaming=False, columns=None):
     """Parse the HTML content and extract game data from the specific table."""
+    if streaming:
+        return parse_html_stream(html_content, columns=columns)
+
+    # Imported here so the streaming path never loads BeautifulSoup
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_content, 'html.parser')
-    
+
     # Find the section with "Copy of Your Data"
     data_section = soup.find('h1', string="Copy of Your Data")
     if not data_section:
         raise ValueError("Could not find Copy of Your Data section")
-        
+
     # Find the Call of Duty section
     cod_heading = data_section.find_next('h1', string=" Call of Duty: Black Ops 6")
     if not cod_heading:
         raise ValueError("Could not find Call of Duty: Black Ops 6 heading")
-        
+
     # Find the h2 heading for multiplayer data
     mp_heading = cod_heading.find_next('h2', string="Multiplayer Match Data (reverse chronological)")
     if not mp_heading:
         raise ValueError("Could not find Multiplayer Match Data heading")
-    
+
     # Get the first table after the multiplayer heading
     table = mp_heading.find_next('table')
     if not table:
         raise ValueError("Could not find match data table")
-    
+
     # Get headers from first row
     headers = []
     for th in table.find_all('th'):
         headers.append(th.text.strip())
-    
-    # Get data rows
-    data = []
+
+    # Get data rows, gathered per column
+    keep = [i for i, header in enumerate(headers) if columns is None or header in columns]
+    values = [[] for _ in keep]
     for row in table.find_all('tr')[1:]:  # Skip header row
         cols = row.find_all('td')
         if len(cols) > 0:
-            row_data = {}
-            for i, col in enumerate(cols):
-                row_data[headers[i]] = col.text.strip()
-            data.append(row_data)
-    
+            for i, column in zip(keep, values):
+                column.append(cols[i].text.strip() if i < len(cols) else None)
+
     # Convert to DataFrame
-    df = pd.DataFrame(data)
-    
-    # Convert numeric columns
-    numeric_columns = ['Score', 'Kills', 'Deaths', 'Shots', 'Hits', 
-                      'Headshots', 'Damage Done', 'Damage Taken',
-                      'Longest Streak', 'Lifetime Kills', 'Lifetime Deaths',
-                      'Lifetime Time Played', 'Assists', 'Executions', 'Suicides',
-                      'Armor Collected', 'Armor Equipped', 'Armor Destroyed',
-                      'Ground Vehicles Used', 'Air Vehicles Used',
-                      'Total XP', 'Score XP', 'Challenge XP', 'Match XP',
-                      'Medal XP', 'Bonus XP', 'Misc XP', 'Accolade XP',
-                      'Weapon XP', 'Operator XP', 'Clan XP', 'Battle Pass XP',
-                      'Rank at Start', 'Rank at End', 'XP at Start', 'XP at End',
-                      'Score at Start', 'Score at End', 'Prestige at Start', 'Prestige at End',
-                      'Lifetime Wall Bangs', 'Lifetime Games Played', 'Lifetime Wins',
-                      'Lifetime Losses', 'Lifetime Hits', 'Lifetime Misses', 'Lifetime Near Misses']
-    
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # Convert UTC timestamps
-    timestamp_columns = ['UTC Timestamp', 'Match Start Timestamp', 'Match End Timestamp']
-    for col in timestamp_columns:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col])
-    
-    # Convert Skill to float
-    if 'Skill' in df.columns:
-        df['Skill'] = df['Skill'].astype(float)
-    
-    # Convert percentage strings to floats
-    if 'Percentage Of Time Moving' in df.columns:
-        df['Percentage Of Time Moving'] = df['Percentage Of Time Moving'].str.rstrip('%').astype(float) / 100
-    
-    return df
+    return build_frame([headers[i] for i in keep], values)
+
+
+def convert_column(values, kind):
+    """Convert a list of cell strings to an array of the given schema kind."""
+    try:
+        if kind == 'datetime':
+            return pd.to_datetime(values, format=TIMESTAMP_FORMAT)
+        if kind == 'category':
+            return pd.Categorical(values)
+        if kind == 'percent':
+            return np.array([v.rstrip('%') for v in values], dtype=np.float32) / 100
+        return np.array(values, dtype=kind)
+    except (ValueError, TypeError, OverflowError, AttributeError):
+        pass
+
+    # Slow path for blanks and malformed cells, same rules as before
+    if kind == 'datetime':
+        return pd.to_datetime(values)
+    if kind == 'percent':
+        return pd.Series(values, dtype=object).str.rstrip('%').astype(float).values / 100
+    return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').values
+
+
+def build_frame(headers, columns):
+    """Build the match DataFrame once from per-column lists of cell strings."""
+    frame_data = {}
+    for name, values in zip(headers, columns):
+        kind = COLUMN_SCHEMA.get(name)
+        frame_data[name] = convert_column(values, kind) if kind else values
+    return pd.DataFrame(frame_data, columns=headers[:len(columns)])
@@ -0,0 +1,215 @@
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import pstats
+import random
+import threading
+import time
+from collections import deque
+
+# Upper bounds of the duration histogram buckets, in seconds
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+
+def payload_bytes(value):
+    """Return the size of value as Dash sends it, or None if it is not serialisable."""
+    from plotly.utils import PlotlyJSONEncoder
+    try:
+        return len(json.dumps(value, cls=PlotlyJSONEncoder))
+    except (TypeError, ValueError):
+        return None
+
+
+class Instrumentation:
+    """Opt-in timings of dashboard callbacks and the stages inside them.
+
+    Each record has a duration and, where known, rows in, rows out and
+    response payload bytes. Totals per stage feed the Prometheus text from
+    metrics_text, and the last `window` records feed the debug panel. When
+    profile_rate is above zero, that fraction of instrumented callbacks also
+    runs under cProfile and the results are merged for profile_text.
+    """
+
+    def __init__(self, enabled=False, window=200, profile_rate=0.0):
+        self.enabled = enabled
+        self.profile_rate = profile_rate
+        self.recent = deque(maxlen=window)
+        self._totals = {}
+        self._gauges = []
+        self._profile = None
+        self._profiled_calls = 0
+        self._collecting = threading.local()
+        self._lock = threading.Lock()
+        # cProfile cannot run twice at once, so concurrent callbacks skip sampling
+        self._profiler_lock = threading.Lock()
+
+    def record(self, name, seconds, rows_in=None, rows_out=None, payload_bytes=None, **extra):
+        entry = {'name': name, 'time': time.time(), 'seconds': seconds, 'rows_in': rows_in,
+                 'rows_out': rows_out, 'payload_bytes': payload_bytes, **extra}
+        collected = getattr(self._collecting, 'records', None)
+        if collected is not None:
+            collected.append(entry)
+        with self._lock:
+            self.recent.append(entry)
+            totals = self._totals.get(name)
+            if totals is None:
+                totals = self._totals[name] = {'count': 0, 'seconds': 0.0, 'buckets': [0] * len(BUCKETS),
+                                               'rows_in': 0, 'rows_out': 0, 'payload_bytes': 0}
+            totals['count'] += 1
+            totals['seconds'] += seconds
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    totals['buckets'][i] += 1
+            for field, value in (('rows_in', rows_in), ('rows_out', rows_out),
+                                 ('payload_bytes', payload_bytes)):
+                if value is not None:
+                    totals[field] += value
+
+    @contextlib.contextmanager
+    def collect(self):
+        """Also gather the records this thread makes inside the block into the yielded list.
+
+        A background callback runs in a child process whose records are lost
+        when it exits; it returns the collected list for replay in the server.
+        """
+        records = []
+        self._collecting.records = records
+        try:
+            yield records
+        finally:
+            self._collecting.records = None
+
+    def replay(self, records):
+        """Record entries gathered by collect, keeping their original times."""
+        for entry in records:
+            self.record(**entry)
+
+    @contextlib.contextmanager
+    def span(self, name, **fields):
+        """Time the enclosed block as stage name.
+
+        Yields a dict; set rows_in, rows_out or payload_bytes on it inside the
+        block to record them.
+        """
+        if not self.enabled:
+            yield fields
+            return
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(name, time.perf_counter() - start, **fields)
+
+    def callback(self, name):
+        """Decorator timing a Dash callback, its response size and serialisation."""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                profiler = self._start_profile()
+                if not self.enabled and profiler is None:
+                    return function(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    if profiler is None:
+                        result = function(*args, **kwargs)
+                    else:
+                        result = profiler.runcall(function, *args, **kwargs)
+                finally:
+                    seconds = time.perf_counter() - start
+                    if profiler is not None:
+                        self._add_profile(profiler)
+                if self.enabled:
+                    start = time.perf_counter()
+                    size = payload_bytes(result)
+                    self.record(f'{name}.serialise', time.perf_counter() - start)
+                    self.record(name, seconds, payload_bytes=size)
+                return result
+            return wrapper
+        return decorate
+
+    def _start_profile(self):
+        if self.profile_rate <= 0 or random.random() >= self.profile_rate:
+            return None
+        if not self._profiler_lock.acquire(blocking=False):
+            return None
+        return cProfile.Profile()
+
+    def _add_profile(self, profiler):
+        try:
+            with self._lock:
+                if self._profile is None:
+                    self._profile = pstats.Stats(profiler)
+                else:
+                    self._profile.add(profiler)
+                self._profiled_calls += 1
+        finally:
+            self._profiler_lock.release()
+
+    def reset_profile(self):
+        with self._lock:
+            self._profile = None
+            self._profiled_calls = 0
+
+    def profile_text(self, limit=25, sort='cumulative'):
+        """Return the merged profile's top functions as pstats prints them."""
+        with self._lock:
+            if self._profile is None:
+                return "No profiled callbacks yet"
+            stream = io.StringIO()
+            self._profile.stream = stream
+            self._profile.sort_stats(sort).print_stats(limit)
+            calls = self._profiled_calls
+        return f"{calls} profiled callbacks\n{stream.getvalue()}"
+
+    def summary(self):
+        """Return per-stage count, mean and max seconds, and totals, from the recent records."""
+        with self._lock:
+            recent = list(self.recent)
+        stages = {}
+        for entry in recent:
+            stage = stages.setdefault(entry['name'], {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                                                      'rows_in': None, 'rows_out': None,
+                                                      'payload_bytes': None})
+            stage['count'] += 1
+            stage['seconds'] += entry['seconds']
+            stage['max_seconds'] = max(stage['max_seconds'], entry['seconds'])
+            # The latest known value of each size
+            for field in ('rows_in', 'rows_out', 'payload_bytes'):
+                if entry[field] is not None:
+                    stage[field] = entry[field]
+        for stage in stages.values():
+            stage['mean_seconds'] = stage.pop('seconds') / stage['count']
+        return stages
+
+    def gauge(self, name, help, read, type='gauge'):
+        """Export read() as a Prometheus metric; read returns a number."""
+        self._gauges.append((name, help, read, type))
+
+    def metrics_text(self, prefix='dashboard'):
+        """Return the totals and gauges in the Prometheus text exposition format."""
+        with self._lock:
+            totals = {name: dict(values, buckets=list(values['buckets']))
+                      for name, values in sorted(self._totals.items())}
+
+        lines = [f'# HELP {prefix}_stage_seconds Time spent in instrumented callbacks and stages.',
+                 f'# TYPE {prefix}_stage_seconds histogram']
+        for name, values in totals.items():
+            for bound, count in zip(BUCKETS, values['buckets']):
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {values["count"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {values["seconds"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {values["count"]}')
+        for field, help in (('rows_in', 'Rows read by instrumented stages.'),
+                            ('rows_out', 'Rows produced by instrumented stages.'),
+                            ('payload_bytes', 'Serialised response bytes of instrumented callbacks.')):
+            lines.append(f'# HELP {prefix}_stage_{field}_total {help}')
+            lines.append(f'# TYPE {prefix}_stage_{field}_total counter')
+            for name, values in totals.items():
+                lines.append(f'{prefix}_stage_{field}_total{{stage="{name}"}} {values[field]}')
+        for name, help, read, type in self._gauges:
+            lines.append(f'# HELP {prefix}_{name} {help}')
+            lines.append(f'# TYPE {prefix}_{name} {type}')
+            lines.append(f'{prefix}_{name} {read()}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,185 @@
+import os
+import re
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+
+from processing import concat_matches
+
+PART_PATTERN = re.compile(r'^part-(\d{6})-\d+\.parquet$')
+VERSION_PATTERN = re.compile(r'^(\d{6})$')
+
+# Hive partition column, the UTC month of each match
+PARTITION_COLUMN = 'Month'
+
+# Rows per Parquet row group; smaller groups let date and checklist filters
+# skip more of a file
+ROW_GROUP_SIZE = 64 * 1024
+
+
+class MatchStore:
+    """Append-only on-disk store of processed matches.
+
+    Each named dataset is a directory of Parquet files partitioned by month
+    (Month=YYYY-MM/part-<version>-<n>.parquet). Categorical columns are
+    dictionary encoded and derived columns such as 'Local Time' are stored
+    as computed, so reads need no reprocessing. Appending writes only the
+    new rows as the next version; a version is visible once its marker in
+    _versions exists, which lets readers load a consistent snapshot while
+    another process appends.
+
+    query pushes checklist and date range filters down into the Parquet
+    reader, so only the month partitions, row groups and columns a
+    selection needs are read.
+    """
+
+    def __init__(self, root):
+        if pa is None:
+            raise RuntimeError("MatchStore needs pyarrow")
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _directory(self, name):
+        return os.path.join(self.root, name)
+
+    def versions(self, name):
+        """Return the committed versions of a dataset, oldest first."""
+        directory = os.path.join(self._directory(name), '_versions')
+        if not os.path.isdir(directory):
+            return []
+        return sorted(int(entry) for entry in os.listdir(directory) if VERSION_PATTERN.match(entry))
+
+    def exists(self, name, version=None):
+        versions = self.versions(name)
+        return bool(versions) and (version is None or version in versions)
+
+    def files(self, name, version=None):
+        """Return the data files of a dataset up to version, by month then version."""
+        committed = set(self.versions(name))
+        if version is not None:
+            committed = {v for v in committed if v <= version}
+        files = []
+        directory = self._directory(name)
+        for partition in sorted(os.listdir(directory)) if committed else []:
+            if not partition.startswith(PARTITION_COLUMN + '='):
+                continue
+            for entry in sorted(os.listdir(os.path.join(directory, partition))):
+                match = PART_PATTERN.match(entry)
+                if match and int(match.group(1)) in committed:
+                    files.append(os.path.join(directory, partition, entry))
+        return files
+
+    def append(self, name, frame, after=None):
+        """Write frame as the next version of dataset name and return the version.
+
+        With after, frame is written as version after + 1 only, and None is
+        returned if that version has already been taken, i.e. after is no
+        longer the latest version.
+        """
+        directory = self._directory(name)
+        versions_dir = os.path.join(directory, '_versions')
+        os.makedirs(versions_dir, exist_ok=True)
+
+        # Claim a version number; the claim file stays, so O_EXCL fails for
+        # every version another process has claimed, committed or not
+        with self._lock:
+            version = max(self.versions(name), default=0) + 1 if after is None else after + 1
+            while True:
+                claim = os.path.join(versions_dir, f'{version:06d}.claim')
+                try:
+                    # Versions committed before claim files were kept have no claim
+                    if os.path.exists(os.path.join(versions_dir, f'{version:06d}')):
+                        raise FileExistsError(claim)
+                    os.close(os.open(claim, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                    break
+                except FileExistsError:
+                    if after is not None:
+                        return None
+                    version += 1
+
+        table = self._to_table(frame)
+        ds.write_dataset(
+            table, directory, format='parquet',
+            partitioning=ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive'),
+            basename_template=f'part-{version:06d}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            max_rows_per_group=ROW_GROUP_SIZE,
+            min_rows_per_group=min(ROW_GROUP_SIZE, max(len(frame), 1)))
+        open(os.path.join(versions_dir, f'{version:06d}'), 'w').close()
+        return version
+
+    @staticmethod
+    def _to_table(frame):
+        frame = frame.reset_index(drop=True)
+        utc_times = frame['UTC Timestamp'].dt.tz_convert('UTC')
+        frame[PARTITION_COLUMN] = utc_times.dt.strftime('%Y-%m')
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+
+        # One dictionary type for every file, whatever the number of categories
+        fields = []
+        for field in table.schema:
+            if pa.types.is_dictionary(field.type):
+                field = field.with_type(pa.dictionary(pa.int32(), pa.string(), field.type.ordered))
+            fields.append(field)
+        return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+    def _read(self, name, version, columns=None, filter=None):
+        files = self.files(name, version)
+        if not files:
+            return None
+        dataset = ds.dataset(
+            files, format='parquet',
+            partitioning=ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive'),
+            partition_base_dir=self._directory(name))
+        if columns is None:
+            columns = [column for column in dataset.schema.names if column != PARTITION_COLUMN]
+        else:
+            # Columns added to processing after a dataset was stored are skipped
+            columns = [column for column in columns if column in dataset.schema.names]
+        table = dataset.to_table(columns=columns, filter=filter)
+        return table.unify_dictionaries().to_pandas()
+
+    def load(self, name, version=None, columns=None):
+        """Return the matches of dataset name, up to the given version."""
+        frame = self._read(name, version, columns)
+        if frame is None or columns is not None:
+            return frame
+        return concat_matches([frame])
+
+    def query(self, name, version, selections, start_time, end_time, columns=None):
+        """Return the matches with start_time <= 'Local Time' <= end_time whose
+        selections columns take one of the selected values, oldest first.
+
+        selections maps a column to the list of selected values.
+        """
+        if pd.isna(start_time) or pd.isna(end_time):
+            return pd.DataFrame()
+        start_time = pd.Timestamp(start_time).tz_convert('UTC')
+        end_time = pd.Timestamp(end_time).tz_convert('UTC')
+
+        # The month bounds prune partitions, the rest row groups and rows
+        month = ds.field(PARTITION_COLUMN)
+        local_time = ds.field('Local Time')
+        condition = ((month >= start_time.strftime('%Y-%m')) & (month <= end_time.strftime('%Y-%m'))
+                     & (local_time >= pa.scalar(start_time)) & (local_time <= pa.scalar(end_time)))
+        for column, values in selections.items():
+            condition = condition & ds.field(column).isin(list(values))
+
+        frame = self._read(name, version, columns, condition)
+        if frame is None or 'Local Time' not in frame.columns:
+            return frame
+        return concat_matches([frame]) if len(frame) else frame
+
+    def match_ids(self, name, version=None):
+        """Return the set of Match IDs stored for dataset name, up to version."""
+        frame = self._read(name, version, ['Match ID'])
+        if frame is None:
+            return set()
+        return set(frame['Match ID'].astype(str))
@@ -0,0 +1,115 @@
+import datetime
+import numpy as np
+import pandas as pd
+
+# Game types that are not real multiplayer matches
+EXCLUDED_GAME_TYPES = [
+    'Pentathlon Hint (TDM Example: Eliminate the other team or be holding the flag when time runs out.)',
+    'Training Course',
+    'Ran-snack',
+    'Stop and Go',
+    'Red Light Green Light',
+    'Prop Hunt',
+]
+
+TIMESTAMP_COLUMNS = ['UTC Timestamp', 'Match Start Timestamp', 'Match End Timestamp']
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# 'Hour' of matches without a timestamp; they fall outside every date range,
+# so no chart reads it
+MISSING_HOUR = -1
+
+
+# Export columns each processed column is computed from
+DERIVED_COLUMNS = {
+    'Local Time': ['UTC Timestamp'],
+    'Accuracy': ['Hits', 'Shots'],
+    'KD_Ratio': ['Kills', 'Deaths'],
+    'Headshot_Ratio': ['Headshots', 'Kills'],
+    'Hour': ['UTC Timestamp'],
+    'Day': ['UTC Timestamp'],
+    'Match Duration': ['Match Start Timestamp', 'Match End Timestamp'],
+}
+
+
+def source_columns(columns):
+    """Return the export columns needed to produce the given processed columns.
+
+    Every column process_data itself reads is always included.
+    """
+    needed = {'Game Type'}.union(*DERIVED_COLUMNS.values())
+    for col in columns:
+        needed.update(DERIVED_COLUMNS.get(col, [col]))
+    return sorted(needed)
+
+
+def local_timezone():
+    """Return the server's current local timezone."""
+    return datetime.datetime.now().astimezone().tzinfo
+
+
+def process_data(data):
+    """Apply the load-time processing shared by every data source."""
+    # Filter out unwanted game types
+    data = data[~data['Game Type'].isin(EXCLUDED_GAME_TYPES)].reset_index(drop=True)
+
+    # Convert timestamps and timezone
+    for col in TIMESTAMP_COLUMNS:
+        if col in data.columns:
+            data[col] = pd.to_datetime(data[col])
+            data[col] = data[col].dt.tz_localize('UTC')
+
+    data['Local Time'] = data['UTC Timestamp'].dt.tz_convert(local_timezone())
+
+    # Oldest match first, so date ranges are contiguous row slices
+    data = data.sort_values('Local Time', kind='stable', na_position='first').reset_index(drop=True)
+    return add_derived_metrics(data)
+
+
+def add_derived_metrics(data):
+    """Add the per-match metrics used by the charts and stats as compact columns."""
+    kills = data['Kills'].to_numpy(dtype=np.float64)
+    deaths = data['Deaths'].to_numpy(dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accuracy = np.round(data['Hits'].to_numpy(dtype=np.float64) / data['Shots'].to_numpy(dtype=np.float64), 3)
+        kd_ratio = np.round(np.where(deaths > 0, kills / deaths, kills), 2)
+        headshot_ratio = data['Headshots'].to_numpy(dtype=np.float64) / kills
+
+    data['Accuracy'] = np.clip(accuracy, 0, 1).astype(np.float32)  # Limit to valid range
+    data['KD_Ratio'] = kd_ratio.astype(np.float32)
+    data['Headshot_Ratio'] = np.where(np.isnan(headshot_ratio), 0, headshot_ratio).astype(np.float32)
+
+    # Time-based features use local time
+    data['Hour'] = data['Local Time'].dt.hour.fillna(MISSING_HOUR).astype(np.int8)
+    data['Day'] = pd.Categorical(data['Local Time'].dt.day_name(), categories=DAY_ORDER, ordered=True)
+    durations = data['Match End Timestamp'] - data['Match Start Timestamp']
+    data['Match Duration'] = durations.dt.total_seconds().fillna(0).astype(np.int32)
+    return data
+
+
+def concat_matches(frames):
+    """Concatenate processed frames, keeping categorical columns categorical.
+
+    Matches are de-duplicated on Match ID and returned oldest first.
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) > 1:
+        frames = [frame.copy(deep=False) for frame in frames]
+        for col in frames[0].columns:
+            columns = [frame[col] for frame in frames if col in frame.columns]
+            if not all(isinstance(c.dtype, pd.CategoricalDtype) for c in columns):
+                continue
+            if all(c.dtype == columns[0].dtype for c in columns):
+                continue
+            categories = pd.api.types.union_categoricals(columns, ignore_order=True).categories
+            for frame in frames:
+                if col in frame.columns:
+                    frame[col] = frame[col].cat.set_categories(categories)
+    data = pd.concat(frames, ignore_index=True)
+    if 'Match ID' in data.columns:
+        data = data.drop_duplicates('Match ID', keep='last')
+    return data.sort_values('Local Time', kind='stable', na_position='first').reset_index(drop=True)
@@ -0,0 +1,14 @@
+from figures import FIGURE_COLUMNS
+from filter_index import FILTER_DIMENSIONS
+from processing import source_columns
+from stats import STATS_COLUMNS
+
+# Export columns the dashboard needs: what the filters, figures and stats
+# read, plus Match ID for merging uploads
+DASHBOARD_COLUMNS = source_columns(
+    set(FILTER_DIMENSIONS + ['Local Time', 'Match ID'] + STATS_COLUMNS).union(*FIGURE_COLUMNS.values()))
+
+# Processed columns read from a filter selection: the figures and stats
+# cards share one selection per filter state, so this covers all of them
+FILTERED_COLUMNS = sorted(
+    set(FILTER_DIMENSIONS + ['Local Time', 'Match ID'] + STATS_COLUMNS).union(*FIGURE_COLUMNS.values()))
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+
+class SufficientStats:
+    """Per-group sums needed for an ordinary least squares line fit.
+
+    The sums are additive, so stats of disjoint selections can be combined
+    with +.
+    """
+
+    def __init__(self, groups, n, sum_x, sum_y, sum_xy, sum_xx, min_x, max_x):
+        self.groups = pd.Index(groups)
+        self.n = n
+        self.sum_x = sum_x
+        self.sum_y = sum_y
+        self.sum_xy = sum_xy
+        self.sum_xx = sum_xx
+        self.min_x = min_x
+        self.max_x = max_x
+
+    @classmethod
+    def from_columns(cls, x, y, groups):
+        """Compute the stats of y against x for each value of groups in one pass."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if isinstance(groups.dtype, pd.CategoricalDtype):
+            codes, labels = groups.cat.codes.to_numpy(), groups.cat.categories
+        else:
+            codes, labels = pd.factorize(groups)
+
+        # Rows with a missing value take no part in the fit
+        valid = np.isfinite(x) & np.isfinite(y) & (codes >= 0)
+        x, y, codes = x[valid], y[valid], codes[valid]
+        size = len(labels)
+
+        min_x = np.full(size, np.inf)
+        max_x = np.full(size, -np.inf)
+        np.minimum.at(min_x, codes, x)
+        np.maximum.at(max_x, codes, x)
+        return cls(labels,
+                   np.bincount(codes, minlength=size),
+                   np.bincount(codes, weights=x, minlength=size),
+                   np.bincount(codes, weights=y, minlength=size),
+                   np.bincount(codes, weights=x * y, minlength=size),
+                   np.bincount(codes, weights=x * x, minlength=size),
+                   min_x, max_x)
+
+    def __add__(self, other):
+        if not self.groups.equals(other.groups):
+            raise ValueError("SufficientStats must share the same groups to be combined")
+        return SufficientStats(self.groups, self.n + other.n,
+                               self.sum_x + other.sum_x, self.sum_y + other.sum_y,
+                               self.sum_xy + other.sum_xy, self.sum_xx + other.sum_xx,
+                               np.minimum(self.min_x, other.min_x),
+                               np.maximum(self.max_x, other.max_x))
+
+    def fit(self):
+        """Return a DataFrame of slope, intercept and x extent per fittable group."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            denominator = self.n * self.sum_xx - self.sum_x ** 2
+            slope = (self.n * self.sum_xy - self.sum_x * self.sum_y) / denominator
+            intercept = (self.sum_y - slope * self.sum_x) / self.n
+        fits = pd.DataFrame({'slope': slope, 'intercept': intercept,
+                             'min_x': self.min_x, 'max_x': self.max_x, 'n': self.n},
+                            index=self.groups)
+        # A line needs two points with different x
+        spread = denominator > 1e-12 * self.n * self.sum_xx
+        return fits[(fits['n'] >= 2) & spread]
@@ -0,0 +1,109 @@
+import numpy as np
+
+# Processed columns read by compute_stats
+STATS_COLUMNS = ['Kills', 'Deaths', 'Match Outcome', 'Shots', 'Hits', 'Score',
+                 'Match Duration', 'Skill', 'Longest Streak']
+
+# Per-match measures behind the stats cards. All but best_streak are summed
+# over a selection and best_streak takes the maximum, so totals of disjoint
+# groups of matches (such as StatsCube cells) combine into the same numbers.
+ADDITIVE_MEASURES = ['matches', 'kills', 'deaths', 'wins', 'shots', 'hits', 'seconds',
+                     'score_sum', 'score_count', 'skill_sum', 'skill_count']
+
+
+def format_play_time(total_seconds):
+    """Format a number of seconds as days, hours and minutes."""
+    days = total_seconds // (24 * 60 * 60)
+    remaining_seconds = total_seconds % (24 * 60 * 60)
+    hours = remaining_seconds // (60 * 60)
+    minutes = (remaining_seconds % (60 * 60)) // 60
+    return f"{days}d {hours}h {minutes}m"
+
+
+def match_measures(data):
+    """Return each match's measures as float64 arrays keyed by measure name.
+
+    Missing values count as 0 in sums and are left out of means and the
+    best streak, as pandas' sum, mean and max skip them.
+    """
+    def values(column):
+        return data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    score = values('Score')
+    # Skill is float32 in the parser's schema; rounding its float32 mean to
+    # two places shows as e.g. 1507.8299560546875, so it is summed as float64
+    skill = values('Skill')
+    outcome = data['Match Outcome'].str.lower().str.contains('win')
+    return {
+        'matches': np.ones(len(data)),
+        'kills': np.nan_to_num(values('Kills')),
+        'deaths': np.nan_to_num(values('Deaths')),
+        'wins': outcome.to_numpy(dtype=np.float64, na_value=0),
+        'shots': np.nan_to_num(values('Shots')),
+        'hits': np.nan_to_num(values('Hits')),
+        'seconds': np.nan_to_num(values('Match Duration')),
+        'score_sum': np.nan_to_num(score),
+        'score_count': (~np.isnan(score)).astype(np.float64),
+        'skill_sum': np.nan_to_num(skill),
+        'skill_count': (~np.isnan(skill)).astype(np.float64),
+        'best_streak': values('Longest Streak'),
+    }
+
+
+def total_measures(measures, positions=None):
+    """Combine per-match (or per-cell) measures into one set of totals."""
+    if positions is not None:
+        measures = {name: values[positions] for name, values in measures.items()}
+    totals = {name: float(measures[name].sum()) for name in ADDITIVE_MEASURES}
+    streaks = measures['best_streak']
+    streaks = streaks[~np.isnan(streaks)]
+    totals['best_streak'] = float(streaks.max()) if len(streaks) else None
+    return totals
+
+
+def combine_totals(*parts):
+    """Add up totals from total_measures."""
+    totals = {name: sum(part[name] for part in parts) for name in ADDITIVE_MEASURES}
+    streaks = [part['best_streak'] for part in parts if part['best_streak'] is not None]
+    totals['best_streak'] = max(streaks) if streaks else None
+    return totals
+
+
+def stats_from_totals(totals):
+    """Return the stats card numbers for a set of totals as a dict."""
+    total_games = int(totals['matches'])
+    if not total_games:
+        return {'matches': 0, 'kd_ratio': 0.0, 'win_rate': 0.0, 'accuracy': 0.0,
+                'avg_score': 0, 'avg_skill': None, 'best_streak': None,
+                'total_seconds': 0, 'total_time': format_play_time(0)}
+
+    total_kills = totals['kills']
+    total_deaths = totals['deaths']
+    total_shots = totals['shots']
+    total_hits = totals['hits']
+
+    # Total time played from match durations
+    total_seconds = int(totals['seconds'])
+
+    def mean(name):
+        count = totals[f'{name}_count']
+        return totals[f'{name}_sum'] / count if count else float('nan')
+
+    return {
+        'matches': total_games,
+        'kd_ratio': round(total_kills / (total_deaths or 1), 2),  # Use 1 if total_deaths is 0
+        'win_rate': round((totals['wins'] / total_games) * 100, 1),
+        'accuracy': round((total_hits / (total_shots or 1)) * 100, 1),  # Use 1 if total_shots is 0
+        'avg_score': int(round(mean('score'), 0)),
+        'avg_skill': round(mean('skill'), 2),
+        'best_streak': None if totals['best_streak'] is None else int(totals['best_streak']),
+        'total_seconds': total_seconds,
+        'total_time': format_play_time(total_seconds),
+    }
+
+
+def compute_stats(data):
+    """Return the stats card numbers for a frame of processed matches as a dict."""
+    if data.empty:
+        return stats_from_totals({'matches': 0})
+    return stats_from_totals(total_measures(match_measures(data)))
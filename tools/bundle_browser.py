@@ -0,0 +1,213 @@
+"""Prepare the in-browser (Pyodide) build served by index.html.
+
+Run from the repository root:
+
+    python tools/bundle_browser.py            # refresh browser/manifest.json
+    python tools/bundle_browser.py --wheels   # also bundle wheels into browser/wheels
+    python tools/bundle_browser.py --check    # fail if browser/manifest.json is stale
+
+browser/manifest.json lists the app modules index.html writes into the
+Pyodide file system, the packages loaded from the Pyodide distribution (and
+the optional ones loaded after startup where it has them), the packages
+installed with micropip, and the smaller set of modules and packages
+browser/parser_worker.js needs to parse uploads off the main thread. With
+--wheels the micropip packages and their dependencies are downloaded once as
+pure-Python wheels, pinned to the versions installed here, and index.html
+installs them from browser/wheels instead of resolving them against PyPI on
+every page load.
+
+Regenerate the manifest whenever an app module is added or an import
+changes; --check exits non-zero, without writing anything, when the
+committed manifest no longer matches what the imports need.
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from importlib import metadata
+
+from packaging.requirements import Requirement
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BROWSER_DIR = os.path.join(REPO_ROOT, 'browser')
+WHEELS_DIR = os.path.join(BROWSER_DIR, 'wheels')
+
+PYODIDE_VERSION = '0.24.1'
+PYODIDE_PYTHON = '3.11'
+
+# Loaded with pyodide.loadPackage; BeautifulSoup is left out because the
+# browser only uses the streaming parser
+PYODIDE_PACKAGES = ['micropip', 'numpy', 'pandas', 'markupsafe', 'packaging', 'typing-extensions']
+
+# Loaded when the distribution has them and not waited for at startup:
+# pyarrow lets the parser worker hand frames to the page as Arrow IPC
+OPTIONAL_PYODIDE_PACKAGES = ['pyarrow']
+
+# Installed with micropip; dash ships dcc and html itself, so the old
+# dash-core-components and dash-html-components packages are not needed
+MICROPIP_PACKAGES = ['plotly', 'dash', 'dash-bootstrap-components']
+
+# Dependencies the Pyodide distribution already provides
+PYODIDE_PROVIDED = {'numpy', 'pandas', 'markupsafe', 'packaging', 'typing-extensions',
+                    'setuptools', 'six', 'python-dateutil', 'pytz', 'tzdata', 'micropip'}
+
+ENTRY_MODULE = 'analysis'
+
+# browser/parser_worker.js parses uploads with these modules and packages only
+WORKER_ENTRY_MODULES = ['html_parser', 'processing', 'frame_ipc']
+WORKER_PACKAGES = ['numpy', 'pandas']
+
+
+def normalise(name):
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def app_modules(entries=(ENTRY_MODULE,)):
+    """Return the repository modules imported, directly or not, by entries."""
+    found = set()
+    pending = list(entries)
+    while pending:
+        name = pending.pop()
+        path = os.path.join(REPO_ROOT, f'{name}.py')
+        if name in found or not os.path.exists(path):
+            continue
+        found.add(name)
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.split('.')[0])
+    return sorted(f'{name}.py' for name in found)
+
+
+def dependency_closure(packages):
+    """Return {distribution: installed version} for packages and their dependencies.
+
+    Dependencies the Pyodide distribution provides are left out.
+    """
+    environment = {'python_version': PYODIDE_PYTHON, 'sys_platform': 'emscripten',
+                   'platform_system': 'Emscripten', 'extra': ''}
+    closure = {}
+    pending = list(packages)
+    while pending:
+        name = normalise(pending.pop())
+        if name in closure or name in PYODIDE_PROVIDED:
+            continue
+        dist = metadata.distribution(name)
+        closure[name] = dist.version
+        for line in dist.requires or []:
+            requirement = Requirement(line)
+            if requirement.marker is None or requirement.marker.evaluate(environment):
+                pending.append(requirement.name)
+    return closure
+
+
+def download_wheels(closure):
+    """Download pure-Python wheels of closure into WHEELS_DIR.
+
+    Returns (wheel file names, distributions without a pure-Python wheel);
+    the latter are left for micropip to resolve at startup.
+    """
+    os.makedirs(WHEELS_DIR, exist_ok=True)
+    missing = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, version in sorted(closure.items()):
+            result = subprocess.run(
+                [sys.executable, '-m', 'pip', 'download', '--no-deps', '--only-binary=:all:',
+                 '--platform', 'any', '--implementation', 'py', '--python-version', PYODIDE_PYTHON,
+                 '--quiet', '--dest', tmp, f'{name}=={version}'],
+                capture_output=True, text=True)
+            if result.returncode:
+                missing.append(name)
+        wheels = sorted(os.listdir(tmp))
+        for old in os.listdir(WHEELS_DIR):
+            if old.endswith('.whl'):
+                os.remove(os.path.join(WHEELS_DIR, old))
+        for wheel in wheels:
+            os.replace(os.path.join(tmp, wheel), os.path.join(WHEELS_DIR, wheel))
+    return wheels, missing
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def build_manifest():
+    return {
+        'pyodide_version': PYODIDE_VERSION,
+        'pyodide_packages': PYODIDE_PACKAGES,
+        'optional_pyodide_packages': OPTIONAL_PYODIDE_PACKAGES,
+        'micropip_packages': MICROPIP_PACKAGES,
+        'modules': app_modules(),
+        'worker_packages': WORKER_PACKAGES,
+        'worker_modules': app_modules(WORKER_ENTRY_MODULES),
+    }
+
+
+def check_manifest(path):
+    """Return a list of differences between the manifest at path and build_manifest()."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            current = json.load(f)
+    except FileNotFoundError:
+        return [f"{os.path.relpath(path, REPO_ROOT)} does not exist"]
+    problems = []
+    for key, expected in build_manifest().items():
+        found = current.get(key)
+        if found == expected:
+            continue
+        if isinstance(expected, list) and isinstance(found, list):
+            missing = sorted(set(expected) - set(found))
+            extra = sorted(set(found) - set(expected))
+            if missing:
+                problems.append(f"{key}: missing {', '.join(missing)}")
+            if extra:
+                problems.append(f"{key}: not needed {', '.join(extra)}")
+            if not missing and not extra:
+                problems.append(f"{key}: out of order")
+        else:
+            problems.append(f"{key}: expected {expected!r}, found {found!r}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--wheels', action='store_true',
+                        help='download the micropip packages into browser/wheels')
+    parser.add_argument('--check', action='store_true',
+                        help='exit non-zero if browser/manifest.json is out of date')
+    args = parser.parse_args()
+
+    manifest_path = os.path.join(BROWSER_DIR, 'manifest.json')
+    if args.check:
+        problems = check_manifest(manifest_path)
+        for problem in problems:
+            print(f"browser/manifest.json is stale, {problem}", file=sys.stderr)
+        if problems:
+            print("Run python tools/bundle_browser.py to regenerate it", file=sys.stderr)
+        sys.exit(1 if problems else 0)
+
+    os.makedirs(BROWSER_DIR, exist_ok=True)
+    manifest = build_manifest()
+    write_json(manifest_path, manifest)
+    print(f"browser/manifest.json: {len(manifest['modules'])} modules")
+
+    if args.wheels:
+        closure = dependency_closure(MICROPIP_PACKAGES)
+        wheels, missing = download_wheels(closure)
+        write_json(os.path.join(WHEELS_DIR, 'manifest.json'), {'wheels': wheels, 'micropip': missing})
+        print(f"browser/wheels: {len(wheels)} wheels")
+        if missing:
+            print(f"No pure-Python wheel, installed by micropip at startup: {', '.join(missing)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Serve the in-browser (Pyodide) build locally.
+
+Run from the repository root:
+
+    python tools/serve.py                          # http://localhost:8000/index.html
+    python tools/serve.py --sample 20000           # also serve /samples/export.html
+    python tools/serve.py --sample 20000 --check   # parse it in a headless browser
+
+--check loads browser/worker_test.html in headless Chrome or Chromium, which
+parses the sample export with browser/parser_worker.js, prints the JSON
+outcome and exits non-zero if the worker failed.
+"""
+import argparse
+import functools
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+BROWSERS = ['chromium', 'chromium-browser', 'google-chrome', 'google-chrome-stable']
+
+
+class Handler(SimpleHTTPRequestHandler):
+    """Static files from the repository, plus /samples/ from samples_dir."""
+
+    extensions_map = {
+        **SimpleHTTPRequestHandler.extensions_map,
+        '.js': 'text/javascript',
+        '.wasm': 'application/wasm',
+        '.whl': 'application/zip',
+    }
+
+    def __init__(self, *args, samples_dir=None, **kwargs):
+        self.samples_dir = samples_dir
+        super().__init__(*args, directory=REPO_ROOT, **kwargs)
+
+    def translate_path(self, path):
+        if self.samples_dir and path.startswith('/samples/'):
+            name = os.path.basename(path.split('?', 1)[0])
+            return os.path.join(self.samples_dir, name)
+        return super().translate_path(path)
+
+    def end_headers(self):
+        # The app sources change between reloads while developing
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def check(url, timeout):
+    """Load url in a headless browser and return the JSON in its #result."""
+    browser = next((path for path in map(shutil.which, BROWSERS) if path), None)
+    if browser is None:
+        raise RuntimeError(f"--check needs one of: {', '.join(BROWSERS)}")
+    result = subprocess.run(
+        [browser, '--headless=new', '--disable-gpu', '--no-sandbox',
+         f'--virtual-time-budget={timeout * 1000}', '--dump-dom', url],
+        capture_output=True, text=True, timeout=timeout + 60)
+    match = re.search(r'<pre id="result">(.*?)</pre>', result.stdout, re.S)
+    if match is None or not match.group(1):
+        raise RuntimeError(f"No result from the worker test page:\n{result.stderr[-2000:]}")
+    return json.loads(match.group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--sample', type=int, metavar='MATCHES',
+                        help='write a synthetic export with this many matches to /samples/export.html')
+    parser.add_argument('--check', action='store_true',
+                        help='parse the sample in a headless browser and exit')
+    parser.add_argument('--timeout', type=int, default=300, help='seconds allowed for --check')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as samples_dir:
+        if args.sample:
+            from benchmarks.synthetic import write_export
+            write_export(os.path.join(samples_dir, 'export.html'), args.sample)
+
+        server = ThreadingHTTPServer(('localhost', args.port),
+                                     functools.partial(Handler, samples_dir=samples_dir))
+        base = f'http://localhost:{server.server_port}'
+        if not args.check:
+            print(f"Serving {REPO_ROOT} at {base}/index.html")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            return
+
+        if not args.sample:
+            parser.error('--check needs --sample')
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        outcome = check(f'{base}/browser/worker_test.html?export=/samples/export.html', args.timeout)
+        server.shutdown()
+        print(json.dumps(outcome, indent=2))
+        sys.exit(0 if outcome.get('ok') else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+# Upload IDs are uuid4 hex strings, so they are safe to use as file names
+UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# Bytes read from a request body at a time
+READ_SIZE = 64 * 1024
+
+# Seconds a chunk waits for another write to the same upload to finish, and
+# the age after which a lock file is taken to be left by a writer that died;
+# writers refresh their lock file as blocks arrive
+LOCK_WAIT = 30
+LOCK_STALE = 60
+
+
+class UploadStore:
+    """Chunked, resumable uploads streamed straight to disk.
+
+    An upload is started with its file name and size and then sent as raw
+    chunks, each of which must begin where the file on disk currently ends;
+    a client that lost a chunk asks for the offset and carries on from
+    there. The SHA-256 of the bytes is updated as chunks are written, and a
+    worker process that did not see every chunk rehashes the file when the
+    digest is asked for. Writes to one upload are serialised by a lock file
+    next to it, so they are also exclusive across worker processes. Uploads
+    left for more than max_age seconds are deleted when the next one starts.
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30, max_age=24 * 60 * 60):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._digests = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, upload_id, extension):
+        if not UPLOAD_ID_PATTERN.match(upload_id or ''):
+            raise KeyError(upload_id)
+        return os.path.join(self.directory, upload_id + extension)
+
+    def start(self, filename, size):
+        """Register a new upload of size bytes; returns its ID."""
+        if size < 0 or size > self.max_bytes:
+            raise ValueError(f"Uploads are limited to {self.max_bytes} bytes")
+        self.evict()
+        upload_id = uuid.uuid4().hex
+        with open(self._path(upload_id, '.json'), 'w', encoding='utf-8') as f:
+            json.dump({'filename': filename, 'size': size}, f)
+        open(self._path(upload_id, '.part'), 'wb').close()
+        with self._lock:
+            self._digests[upload_id] = (0, hashlib.sha256())
+        return upload_id
+
+    def info(self, upload_id):
+        """Return {'filename', 'size', 'offset'} for an upload; KeyError if unknown."""
+        try:
+            with open(self._path(upload_id, '.json'), encoding='utf-8') as f:
+                info = json.load(f)
+            info['offset'] = os.path.getsize(self._path(upload_id, '.part'))
+        except FileNotFoundError:
+            raise KeyError(upload_id) from None
+        return info
+
+    @contextlib.contextmanager
+    def _locked(self, upload_id):
+        """Hold the upload's lock file, waiting up to LOCK_WAIT seconds for it.
+
+        Yields the lock file's path. Raises ValueError if it stays taken.
+        """
+        path = self._path(upload_id, '.lock')
+        deadline = time.monotonic() + LOCK_WAIT
+        while True:
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                pass
+            try:
+                if time.time() - os.path.getmtime(path) > LOCK_STALE:
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise ValueError("Another chunk of this upload is still being written")
+            time.sleep(0.05)
+        try:
+            os.close(fd)
+            yield path
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    def write(self, upload_id, offset, stream):
+        """Append the bytes of a file-like stream at offset; returns the new offset.
+
+        Raises ValueError if offset is not the current end of the file or the
+        chunk would run past the upload's size. A chunk sent while another
+        is being written waits for it, then is checked against the new end.
+        """
+        # Unknown uploads fail before a lock file is made for them
+        self.info(upload_id)
+        with self._locked(upload_id) as lock_path:
+            info = self.info(upload_id)
+            if offset != info['offset']:
+                raise ValueError(f"Expected offset {info['offset']}, got {offset}")
+            with self._lock:
+                position, digest = self._digests.pop(upload_id, (None, None))
+            if position != offset:
+                digest = None
+            with open(self._path(upload_id, '.part'), 'ab') as f:
+                while True:
+                    block = stream.read(READ_SIZE)
+                    if not block:
+                        break
+                    if offset + len(block) > info['size']:
+                        f.truncate(info['offset'])
+                        raise ValueError("Chunk runs past the end of the upload")
+                    f.write(block)
+                    if digest is not None:
+                        digest.update(block)
+                    offset += len(block)
+                    os.utime(lock_path)
+            if digest is not None:
+                with self._lock:
+                    self._digests[upload_id] = (offset, digest)
+        return offset
+
+    def complete(self, upload_id):
+        """Return whether every byte of an upload has arrived."""
+        info = self.info(upload_id)
+        return info['offset'] == info['size']
+
+    def digest(self, upload_id):
+        """Return a hashlib SHA-256 object of the uploaded bytes."""
+        path = self._path(upload_id, '.part')
+        with self._lock:
+            position, digest = self._digests.get(upload_id, (None, None))
+        if digest is not None and position == os.path.getsize(path):
+            return digest.copy()
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(READ_SIZE), b''):
+                digest.update(block)
+        return digest
+
+    def open(self, upload_id):
+        """Open the uploaded bytes for reading."""
+        try:
+            return open(self._path(upload_id, '.part'), 'rb')
+        except FileNotFoundError:
+            raise KeyError(upload_id) from None
+
+    def remove(self, upload_id):
+        """Delete an upload and its metadata."""
+        with self._lock:
+            self._digests.pop(upload_id, None)
+        for extension in ('.part', '.json', '.lock'):
+            try:
+                os.remove(self._path(upload_id, extension))
+            except FileNotFoundError:
+                pass
+
+    def evict(self):
+        """Delete uploads that have not been written to for max_age seconds."""
+        cutoff = time.time() - self.max_age
+        for entry in os.scandir(self.directory):
+            name, extension = os.path.splitext(entry.name)
+            if extension != '.json' or not UPLOAD_ID_PATTERN.match(name):
+                continue
+            try:
+                part_mtime = os.path.getmtime(self._path(name, '.part'))
+            except FileNotFoundError:
+                part_mtime = 0
+            if max(part_mtime, entry.stat().st_mtime) < cutoff:
+                self.remove(name)